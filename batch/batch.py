@@ -0,0 +1,106 @@
+import functools
+import json
+from endpoints.endpoints import get_user_endpoint, get_group_endpoint, get_work_package_endpoint
+from payloads.user_payloads import build_user_payload
+from payloads.work_package_payload import build_work_package_payload
+from users.create_user import create_user
+from group.group import change_group_members, failed_group_ids
+from workpackages.create_work_package import create_work_package, patch_work_package_parent
+from results.results import RowResult
+
+BATCH_OPERATIONS = ("create-user", "create-work-package", "patch-parent", "group-members")
+
+_WORK_PACKAGE_FIELDS = (
+    "subject", "project_id", "type_id", "status_id", "priority_id", "author_id", "assignee_id",
+    "category_id", "start_date", "due_date", "description", "parent_id",
+)
+# 비어 있으면 인스턴스 기본값(isDefault)으로 채우는 필드
+_DEFAULT_FIELDS = ("type_id", "status_id", "priority_id")
+
+def _response_result(response, success_codes):
+    result = RowResult.from_response(None, response, success_codes)
+    data = {"ok": result.ok, "status": result.status}
+    if result.ok:
+        data["id"] = result.id
+        if result.lock_version is not None:
+            data["lock_version"] = result.lock_version
+    else:
+        data["error"] = result.error
+    return data
+
+def _create_user(openproject_url, headers, op):
+    payload = build_user_payload(op["login"], op["email"], op["first_name"], op["last_name"], op["password"])
+    result = _response_result(create_user(get_user_endpoint(openproject_url), payload, headers), (201,))
+    if result["ok"] and op.get("group_id"):
+        change_group_members(get_group_endpoint(openproject_url), [op["group_id"]], [result["id"]], headers)
+    return result
+
+def _create_work_package(openproject_url, headers, op, defaults):
+    fields = {k: op[k] for k in _WORK_PACKAGE_FIELDS if k in op}
+    if any(fields.get(col) is None for col in _DEFAULT_FIELDS):
+        for col, default in defaults().items():
+            if fields.get(col) is None:
+                fields[col] = default
+    payload = build_work_package_payload(**fields)
+    return _response_result(create_work_package(get_work_package_endpoint(openproject_url), payload, headers), (201,))
+
+def _patch_parent(openproject_url, headers, op):
+    response = patch_work_package_parent(openproject_url, headers, op["work_package_id"], op["lock_version"], op["parent_id"])
+    return _response_result(response, (200, 201))
+
+def _group_members(openproject_url, headers, op):
+    group_ids = op.get("group_ids") or [op["group_id"]]
+    responses = change_group_members(get_group_endpoint(openproject_url), group_ids, op["user_ids"], headers, remove=op.get("remove", False))
+    failed = failed_group_ids(responses)
+    return {"ok": not failed, "status": None, "failed_groups": failed}
+
+_HANDLERS = {
+    "create-user": _create_user,
+    "create-work-package": _create_work_package,
+    "patch-parent": _patch_parent,
+    "group-members": _group_members,
+}
+
+def run_batch(openproject_url, headers, lines, out, project_id=None):
+    """
+    JSONL 작업 스트림을 한 프로세스/한 세션에서 순서대로 실행
+    각 줄: {"op": "create-user" | "create-work-package" | "patch-parent" | "group-members", ...필드}
+    필드 이름은 CLI 옵션과 같음 (예: first_name, project_id, work_package_id, lock_version, parent_id, user_ids)
+    결과는 입력 줄마다 JSON 한 줄로 out에 기록 ({"line", "op", "ok", "status", "id", ...})
+    project_id: 지정하면 create-work-package 작업의 project_id를 이 값으로 바꿈
+    create-work-package에 type_id/status_id/priority_id가 없으면 인스턴스 기본값 사용 (처음 필요할 때 한 번만 조회)
+    반환: (성공 수, 실패 수)
+    """
+    loaded = []
+
+    def defaults():
+        if not loaded:
+            from metadata.metadata import DEFAULT_SECTIONS, load_metadata, work_package_defaults
+            loaded.append(work_package_defaults(load_metadata(openproject_url, headers, sections=DEFAULT_SECTIONS)))
+        return loaded[0]
+
+    handlers = dict(_HANDLERS, **{"create-work-package": functools.partial(_create_work_package, defaults=defaults)})
+    succeeded = failed = 0
+    for line_no, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        op_name = None
+        try:
+            op = json.loads(line)
+            op_name = op.get("op")
+            handler = handlers.get(op_name)
+            if handler is None:
+                raise ValueError(f"unknown op: {op_name} (가능: {', '.join(BATCH_OPERATIONS)})")
+            if project_id is not None and op_name == "create-work-package":
+                op["project_id"] = project_id
+            result = handler(openproject_url, headers, op)
+        except (ValueError, KeyError, TypeError) as e:
+            result = {"ok": False, "status": None, "error": f"{type(e).__name__}: {e}"}
+        if result["ok"]:
+            succeeded += 1
+        else:
+            failed += 1
+        out.write(json.dumps({"line": line_no, "op": op_name, **result}, ensure_ascii=False) + "\n")
+        out.flush()
+    return succeeded, failed
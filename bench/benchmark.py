@@ -0,0 +1,139 @@
+"""
+Throughput benchmark: runs the real CLI commands against the bundled mock server
+and reports requests/sec, p50/p99 server-side latency and peak RSS per command.
+
+    python3 -m bench.benchmark --rows 2000 --latency-ms 20 --concurrency 8
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import pandas as pd
+from bench.mock_server import MockState, start_mock_server
+
+MAIN_PY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, int(round(pct / 100.0 * len(values))) - 1))
+    return values[index]
+
+def run_command(args, base_url, workdir):
+    """
+    CLI 명령을 별도 프로세스로 실행하고 (경과 시간, 최대 RSS(MB), 종료 코드) 반환
+    """
+    env = dict(os.environ, OPENPROJECT_URL=base_url, OPENPROJECT_API_KEY="benchmark")
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, MAIN_PY] + args, cwd=workdir, env=env,
+                               stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    # returncode 갱신 (wait4가 이미 회수한 프로세스)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    stderr = process.stderr.read().decode("utf-8", "replace")
+    process.stderr.close()
+    if process.returncode != 0:
+        print(stderr, file=sys.stderr)
+    # Linux의 ru_maxrss는 KB 단위
+    return elapsed, usage.ru_maxrss / 1024.0, process.returncode
+
+def summarize(name, rows, elapsed, rss_mb, returncode, requests):
+    durations = [r[3] * 1000.0 for r in requests]
+    statuses = {}
+    for r in requests:
+        statuses[r[2]] = statuses.get(r[2], 0) + 1
+    return {
+        "command": name,
+        "rows": rows,
+        "seconds": round(elapsed, 3),
+        "requests": len(requests),
+        "requests_per_sec": round(len(requests) / elapsed, 1) if elapsed else 0.0,
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(durations, 50), 2),
+        "p99_ms": round(percentile(durations, 99), 2),
+        "peak_rss_mb": round(rss_mb, 1),
+        "statuses": statuses,
+        "exit_code": returncode,
+    }
+
+def write_inputs(workdir, rows):
+    pd.DataFrame({
+        "login": [f"bench{i}" for i in range(rows)],
+        "email": [f"bench{i}@example.com" for i in range(rows)],
+        "firstName": "Bench",
+        "lastName": [f"User{i}" for i in range(rows)],
+        "password": "benchmark-password",
+    }).to_excel(os.path.join(workdir, "users.xlsx"), index=False)
+    pd.DataFrame({
+        "subject": [f"Benchmark {i}" for i in range(rows)],
+        "project_id": 1,
+        "author_id": 1,
+        "start_date": "2026-01-05",
+        "due_date": "2026-01-09",
+    }).to_excel(os.path.join(workdir, "workpackages.xlsx"), index=False)
+
+def write_parent_patches(workdir):
+    # bulk-create-work-packages가 기록한 id, lockVersion으로 첫 행을 부모로 하는 patch 파일 생성
+    created = pd.read_excel(os.path.join(workdir, "workpackages.xlsx"))
+    created = created.dropna(subset=["work_package_id"])
+    parent_id = int(created["work_package_id"].iloc[0])
+    patches = created.iloc[1:][["work_package_id", "lock_version"]].copy()
+    patches["parent_id"] = parent_id
+    patches.to_excel(os.path.join(workdir, "parent_patches.xlsx"), index=False)
+    return len(patches)
+
+def run_benchmarks(rows, latency_ms, jitter_ms, error_rate, concurrency):
+    state = MockState(latency_ms=latency_ms, jitter_ms=jitter_ms, error_rate=error_rate)
+    state.seed(groups=1)
+    server, base_url = start_mock_server(state)
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            write_inputs(workdir, rows)
+            scenarios = [
+                ("bulk-create-users", lambda: rows, ["bulk-create-users", "--excel", "users.xlsx", "--group-id", "1"]),
+                ("bulk-create-work-packages", lambda: rows, ["bulk-create-work-packages", "--concurrency", str(concurrency)]),
+                ("bulk-patch-work-package-parents", lambda: write_parent_patches(workdir),
+                 ["bulk-patch-work-package-parents", "--concurrency", str(concurrency)]),
+                ("export-work-packages", lambda: len(state.work_packages),
+                 ["export-work-packages", "--concurrency", str(concurrency), "--output", "export.xlsx"]),
+            ]
+            for name, count_rows, args in scenarios:
+                scenario_rows = count_rows()
+                state.reset_requests()
+                elapsed, rss_mb, returncode = run_command(args, base_url, workdir)
+                results.append(summarize(name, scenario_rows, elapsed, rss_mb, returncode, state.reset_requests()))
+    finally:
+        server.shutdown()
+    return results
+
+def print_report(results):
+    header = f"{'command':<34}{'rows':>8}{'sec':>9}{'req':>8}{'req/s':>9}{'p50ms':>9}{'p99ms':>9}{'rssMB':>8}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['command']:<34}{r['rows']:>8}{r['seconds']:>9.2f}{r['requests']:>8}{r['requests_per_sec']:>9.1f}"
+              f"{r['p50_ms']:>9.2f}{r['p99_ms']:>9.2f}{r['peak_rss_mb']:>8.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI commands against the mock OpenProject server")
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=10.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--json", dest="json_file", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+    results = run_benchmarks(args.rows, args.latency_ms, args.jitter_ms, args.error_rate, args.concurrency)
+    print_report(results)
+    if args.json_file:
+        with open(args.json_file, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,341 @@
+"""
+OpenProject API v3 stand-in for offline benchmarks.
+
+Serves HAL+JSON for /api/v3/users, /api/v3/groups and /api/v3/work_packages
+(plus static types, statuses, priorities and project categories) with offset/pageSize pagination, lockVersion checks, configurable latency
+and randomly injected 429/503 responses.
+
+    python3 -m bench.mock_server --port 8080 --latency-ms 20 --error-rate 0.01
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_ID_PATTERN = re.compile(r"/(\d+)(?=/|$)")
+
+def _now():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def _link_id(link):
+    if not link or not link.get("href"):
+        return None
+    return int(link["href"].rstrip("/").split("/")[-1])
+
+class MockState:
+    """
+    서버 메모리 상태 + 요청 기록
+    """
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, retry_after=1, max_page_size=1000):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.max_page_size = max_page_size
+        self.lock = threading.Lock()
+        self.users = {}
+        self.groups = {}
+        self.work_packages = {}
+        self.next_id = {"users": 1, "groups": 1, "work_packages": 1}
+        self.requests = []
+        self._random = random.Random(0)
+
+    def new_id(self, kind):
+        with self.lock:
+            new_id = self.next_id[kind]
+            self.next_id[kind] += 1
+            return new_id
+
+    def add_group(self, name, members=()):
+        group_id = self.new_id("groups")
+        self.groups[group_id] = {"id": group_id, "name": name, "members": list(members)}
+        return group_id
+
+    def add_user(self, login, email=None):
+        user_id = self.new_id("users")
+        self.users[user_id] = {
+            "id": user_id, "login": login, "email": email or f"{login}@example.com",
+            "firstName": login, "lastName": "Mock", "status": "active",
+        }
+        return user_id
+
+    def add_work_package(self, payload):
+        wp_id = self.new_id("work_packages")
+        wp = {
+            "id": wp_id,
+            "subject": payload.get("subject"),
+            "startDate": payload.get("startDate"),
+            "dueDate": payload.get("dueDate"),
+            "duration": payload.get("duration"),
+            "description": payload.get("description") or {"raw": ""},
+            "lockVersion": 0,
+            "createdAt": _now(),
+            "updatedAt": _now(),
+            "_links": dict(payload.get("_links", {})),
+        }
+        self.work_packages[wp_id] = wp
+        return wp
+
+    def seed(self, users=0, groups=1, work_packages=0):
+        for i in range(groups):
+            self.add_group(f"Group {i + 1}")
+        for i in range(users):
+            self.add_user(f"seed{i + 1}")
+        for i in range(work_packages):
+            self.add_work_package({
+                "subject": f"Seed {i + 1}",
+                "_links": {
+                    "project": {"href": "/api/v3/projects/1"},
+                    "type": {"href": "/api/v3/types/1"},
+                    "status": {"href": "/api/v3/statuses/1"},
+                    "priority": {"href": "/api/v3/priorities/8"},
+                    "author": {"href": "/api/v3/users/1"},
+                },
+            })
+
+    def record(self, method, template, status, duration, size):
+        with self.lock:
+            self.requests.append((method, template, status, duration, size))
+
+    def reset_requests(self):
+        with self.lock:
+            requests = self.requests
+            self.requests = []
+        return requests
+
+def _collection(elements, offset, page_size, total=None):
+    return {
+        "_type": "Collection",
+        "total": len(elements) if total is None else total,
+        "count": len(elements),
+        "pageSize": page_size,
+        "offset": offset,
+        "_embedded": {"elements": elements},
+    }
+
+def _paginate(items, query, max_page_size):
+    offset = max(int(query.get("offset", ["1"])[0]), 1)
+    page_size = min(int(query.get("pageSize", ["20"])[0]), max_page_size)
+    page = items[(offset - 1) * page_size:offset * page_size]
+    return _collection(page, offset, page_size, total=len(items))
+
+def _user_resource(user):
+    return {"_type": "User", **user, "_links": {"self": {"href": f"/api/v3/users/{user['id']}"}}}
+
+def _group_resource(group):
+    return {
+        "_type": "Group", "id": group["id"], "name": group["name"],
+        "_links": {
+            "self": {"href": f"/api/v3/groups/{group['id']}"},
+            "members": [{"href": f"/api/v3/users/{uid}"} for uid in group["members"]],
+        },
+    }
+
+def _work_package_resource(wp):
+    return {"_type": "WorkPackage", **wp, "_links": {"self": {"href": f"/api/v3/work_packages/{wp['id']}"}, **wp["_links"]}}
+
+_METADATA = {
+    "/api/v3/types": [
+        {"_type": "Type", "id": 1, "name": "Task", "isDefault": True},
+        {"_type": "Type", "id": 2, "name": "Milestone", "isDefault": False},
+        {"_type": "Type", "id": 3, "name": "Phase", "isDefault": False},
+    ],
+    "/api/v3/statuses": [
+        {"_type": "Status", "id": 1, "name": "New", "isDefault": True},
+        {"_type": "Status", "id": 7, "name": "In progress", "isDefault": False},
+        {"_type": "Status", "id": 12, "name": "Closed", "isDefault": False},
+    ],
+    "/api/v3/priorities": [
+        {"_type": "Priority", "id": 7, "name": "Low", "isDefault": False},
+        {"_type": "Priority", "id": 8, "name": "Normal", "isDefault": True},
+        {"_type": "Priority", "id": 9, "name": "High", "isDefault": False},
+    ],
+}
+
+_CLOSED_STATUS_IDS = {12}
+
+_LINK_FILTERS = {"project": "project", "status": "status", "type": "type", "assignee": "assignee", "author": "author", "parent": "parent"}
+
+def _select(resource, select):
+    """
+    select=total,elements/id,... 중 elements/ 필드만 남긴 리소스 (링크는 _links에서 선택)
+    """
+    fields = {f.split("/", 1)[1] for f in select.split(",") if f.startswith("elements/")}
+    selected = {key: value for key, value in resource.items() if key in fields}
+    selected["_links"] = {key: value for key, value in resource["_links"].items() if key in fields}
+    return selected
+
+def _matches(wp, filters):
+    for flt in filters:
+        for name, spec in flt.items():
+            operator = spec.get("operator")
+            values = spec.get("values", [])
+            if name == "id":
+                if wp["id"] not in {int(v) for v in values}:
+                    return False
+            elif name == "updatedAt" and operator == "<>d":
+                since, until = (values + ["", ""])[:2]
+                if since and wp["updatedAt"] < since:
+                    return False
+                if until and wp["updatedAt"] > until:
+                    return False
+            elif name == "status" and operator in ("o", "c"):
+                closed = _link_id(wp["_links"].get("status")) in _CLOSED_STATUS_IDS
+                if closed != (operator == "c"):
+                    return False
+            elif name in _LINK_FILTERS and operator == "=":
+                if str(_link_id(wp["_links"].get(_LINK_FILTERS[name]))) not in {str(v) for v in values}:
+                    return False
+    return True
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문이 따로 전송될 때 Nagle + delayed ACK로 생기는 40ms 지연 방지
+    disable_nagle_algorithm = True
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=None, extra_headers=None):
+        data = json.dumps(body if body is not None else {}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/hal+json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (extra_headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+        return len(data)
+
+    def _body(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw) if raw else {}
+
+    def _handle(self, method):
+        started = time.perf_counter()
+        url = urlparse(self.path)
+        template = _ID_PATTERN.sub("/{id}", url.path)
+        body = self._body() if method in ("POST", "PATCH") else None
+        state = self.state
+        delay = state.latency_ms + (state._random.uniform(0, state.jitter_ms) if state.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000.0)
+        if state.error_rate and state._random.random() < state.error_rate:
+            status = state._random.choice((429, 503))
+            size = self._send(status, {"message": "injected"}, {"Retry-After": str(state.retry_after)})
+        else:
+            status, payload = self._route(method, url.path, parse_qs(url.query), body)
+            size = self._send(status, payload)
+        state.record(method, template, status, time.perf_counter() - started, size)
+
+    def _route(self, method, path, query, body):
+        state = self.state
+        match = _ID_PATTERN.search(path)
+        item_id = int(match.group(1)) if match else None
+        if path.startswith("/api/v3/users"):
+            if item_id is None and method == "GET":
+                users = [_user_resource(u) for _, u in sorted(state.users.items())]
+                return 200, _paginate(users, query, state.max_page_size)
+            if item_id is None and method == "POST":
+                with state.lock:
+                    if any(u["login"] == body.get("login") or u["email"] == body.get("email") for u in state.users.values()):
+                        return 422, {"_type": "Error", "message": "Login has already been taken."}
+                user_id = state.add_user(body.get("login"), body.get("email"))
+                return 201, _user_resource(state.users[user_id])
+            if item_id in state.users and method == "GET":
+                return 200, _user_resource(state.users[item_id])
+        elif path.startswith("/api/v3/groups"):
+            if item_id is None and method == "GET":
+                groups = [_group_resource(g) for _, g in sorted(state.groups.items())]
+                return 200, _paginate(groups, query, state.max_page_size)
+            if item_id in state.groups:
+                group = state.groups[item_id]
+                if method == "PATCH":
+                    with state.lock:
+                        if "members" in body.get("_links", {}):
+                            group["members"] = [_link_id(link) for link in body["_links"]["members"]]
+                        if body.get("name"):
+                            group["name"] = body["name"]
+                return 200, _group_resource(group)
+        elif path in _METADATA and method == "GET":
+            return 200, _paginate(_METADATA[path], query, state.max_page_size)
+        elif path.startswith("/api/v3/projects/") and path.endswith("/categories") and method == "GET":
+            categories = [{"_type": "Category", "id": item_id * 10 + i, "name": name} for i, name in enumerate(("Backend", "Frontend"), 1)]
+            return 200, _paginate(categories, query, state.max_page_size)
+        elif path.startswith("/api/v3/work_packages"):
+            if item_id is None and method == "GET":
+                filters = json.loads(query["filters"][0]) if "filters" in query else []
+                items = [_work_package_resource(wp) for _, wp in sorted(state.work_packages.items()) if _matches(wp, filters)]
+                if "select" in query:
+                    items = [_select(item, query["select"][0]) for item in items]
+                return 200, _paginate(items, query, state.max_page_size)
+            if item_id is None and method == "POST":
+                return 201, _work_package_resource(state.add_work_package(body))
+            if item_id in state.work_packages:
+                wp = state.work_packages[item_id]
+                if method == "GET":
+                    return 200, _work_package_resource(wp)
+                if method == "PATCH":
+                    with state.lock:
+                        if body.get("lockVersion") != wp["lockVersion"]:
+                            return 409, {"_type": "Error", "message": "The resource was changed in the meantime."}
+                        for key, value in body.items():
+                            if key == "_links":
+                                wp["_links"].update(value)
+                            elif key != "lockVersion":
+                                wp[key] = value
+                        wp["lockVersion"] += 1
+                        wp["updatedAt"] = _now()
+                    return 200, _work_package_resource(wp)
+        return 404, {"_type": "Error", "message": "Not found"}
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_PATCH(self):
+        self._handle("PATCH")
+
+def start_mock_server(state, host="127.0.0.1", port=0):
+    """
+    백그라운드 스레드에서 mock 서버 시작, (server, base_url) 반환
+    """
+    handler = type("BoundMockHandler", (MockHandler,), {"state": state})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock OpenProject API v3 server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429/503")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed-users", type=int, default=0)
+    parser.add_argument("--seed-groups", type=int, default=1)
+    parser.add_argument("--seed-work-packages", type=int, default=0)
+    args = parser.parse_args()
+    state = MockState(args.latency_ms, args.jitter_ms, args.error_rate, args.retry_after)
+    state.seed(users=args.seed_users, groups=args.seed_groups, work_packages=args.seed_work_packages)
+    server, base_url = start_mock_server(state, args.host, args.port)
+    print(f"Mock OpenProject listening on {base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
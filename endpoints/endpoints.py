@@ -1,3 +1,6 @@
+import json
+from urllib.parse import quote
+
 def get_user_endpoint(openproject_url):
     """
     Returns the API endpoint for users.
@@ -16,9 +19,12 @@ def get_work_package_endpoint(openproject_url):
     """
     return f"{openproject_url}/api/v3/work_packages"
 
-def get_work_packages_list_endpoint(openproject_url, offset=None, page_size=None):
+def get_work_packages_list_endpoint(openproject_url, offset=None, page_size=None, filters=None, select=None):
     """
-    Returns the API endpoint for listing work packages with optional offset and pageSize.
+    Returns the API endpoint for listing work packages with optional offset, pageSize, filters and select.
+    filters: list of OpenProject filter dicts, e.g. [{"status": {"operator": "o", "values": []}}].
+    An empty list disables the server's default filter (open work packages only).
+    select: list of properties to render, e.g. ["total", "elements/id", "elements/subject"].
     """
     base = f"{openproject_url}/api/v3/work_packages"
     params = []
@@ -26,6 +32,34 @@ def get_work_packages_list_endpoint(openproject_url, offset=None, page_size=None
         params.append(f"offset={offset}")
     if page_size is not None:
         params.append(f"pageSize={page_size}")
+    if filters is not None:
+        params.append(f"filters={quote(json.dumps(filters, separators=(',', ':')))}")
+    if select:
+        params.append(f"select={quote(','.join(select), safe=',/')}")
     if params:
         return base + "?" + "&".join(params)
     return base
+
+def get_types_endpoint(openproject_url):
+    """
+    Returns the API endpoint for work package types.
+    """
+    return f"{openproject_url}/api/v3/types"
+
+def get_statuses_endpoint(openproject_url):
+    """
+    Returns the API endpoint for work package statuses.
+    """
+    return f"{openproject_url}/api/v3/statuses"
+
+def get_priorities_endpoint(openproject_url):
+    """
+    Returns the API endpoint for work package priorities.
+    """
+    return f"{openproject_url}/api/v3/priorities"
+
+def get_project_categories_endpoint(openproject_url, project_id):
+    """
+    Returns the API endpoint for the categories of a project.
+    """
+    return f"{openproject_url}/api/v3/projects/{project_id}/categories"
@@ -0,0 +1,188 @@
+import csv
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+from requester.parallel import run_in_parallel
+
+# --project-id로 대상별 프로젝트를 바꿀 수 있는 명령
+PROJECT_OVERRIDE_COMMANDS = ("bulk-create-work-packages", "stream-create-work-packages", "run-batch")
+# 대상 디렉터리로 복사하는 입력 파일 옵션 (엑셀 write-back, journal, 결과 파일이 대상마다 따로 생기도록)
+INPUT_FILE_OPTIONS = ("--excel", "--input")
+
+# 통합 보고서 컬럼
+REPORT_COLUMNS = ["target", "url", "project_id", "exit_code", "seconds", "succeeded", "failed", "summary", "log"]
+
+# 명령 출력의 요약 줄 (ProgressPrinter.summary, run-batch): "📊 ...: 성공 N건, 실패 M건 ..."
+_SUMMARY_COUNTS = re.compile(r"성공 (\d+)건, 실패 (\d+)건")
+
+def load_targets(targets_file):
+    """
+    대상 파일(JSON 리스트) 읽기
+    각 항목: {"name": 대상 이름, "url": OpenProject URL, "api_key" 또는 "api_key_env": API 키 또는 키가 들어 있는 환경 변수 이름,
+              "project_id": 프로젝트 덮어쓰기(선택), "env": 대상별 추가 환경 변수(선택, 예: {"OPENPROJECT_POOL_SIZE": "16"})}
+    반환: api_key가 채워진 대상 dict 리스트
+    """
+    with open(targets_file, encoding="utf-8") as f:
+        entries = json.load(f)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{targets_file}: 대상 목록(JSON 리스트)이 비어 있습니다.")
+    targets = []
+    names = set()
+    for i, entry in enumerate(entries, 1):
+        name = entry.get("name")
+        if not name or os.sep in name or name in (".", ".."):
+            raise ValueError(f"{i}번째 대상: name이 없거나 디렉터리 이름으로 쓸 수 없습니다 ({name!r})")
+        if name in names:
+            raise ValueError(f"대상 이름 중복: {name}")
+        names.add(name)
+        if not entry.get("url"):
+            raise ValueError(f"{name}: url이 없습니다.")
+        api_key = entry.get("api_key")
+        if api_key is None and entry.get("api_key_env"):
+            api_key = os.getenv(entry["api_key_env"])
+            if api_key is None:
+                raise ValueError(f"{name}: 환경 변수 {entry['api_key_env']}가 설정되어 있지 않습니다.")
+        if not api_key:
+            raise ValueError(f"{name}: api_key 또는 api_key_env가 없습니다.")
+        project_id = entry.get("project_id")
+        targets.append({
+            "name": name,
+            "url": entry["url"].rstrip("/"),
+            "api_key": api_key,
+            "project_id": int(project_id) if project_id is not None else None,
+            "env": {k: str(v) for k, v in (entry.get("env") or {}).items()},
+        })
+    return targets
+
+def _copy_input(spec, target_dir, resume, used_names):
+    """
+    입력 파일("file.xlsx" 또는 "file.xlsx#Sheet")을 대상 디렉터리로 복사하고 복사본 spec 반환
+    파일 이름이 같은 다른 입력(a/wp.xlsx, b/wp.xlsx)은 "2-wp.xlsx"처럼 순번을 붙여 따로 복사
+    (같은 명령 인자면 항상 같은 이름이 되므로 --resume에서도 같은 복사본을 찾음)
+    used_names: {복사본 이름: 원본 경로} (한 대상의 인자 전체에서 공유)
+    resume이면 이전 실행의 복사본(write-back된 id 포함)을 그대로 사용
+    """
+    path, sep, sheet = spec.partition("#")
+    if path == "-":
+        raise ValueError("fan-out에서는 stdin(-) 입력을 쓸 수 없습니다.")
+    source = os.path.abspath(path)
+    name = os.path.basename(path)
+    index = 1
+    while used_names.get(name, source) != source:
+        index += 1
+        name = f"{index}-{os.path.basename(path)}"
+    used_names[name] = source
+    dest = os.path.abspath(os.path.join(target_dir, name))
+    if not (resume and os.path.exists(dest)):
+        shutil.copy2(path, dest)
+    return dest + sep + sheet
+
+def prepare_target_args(args, target, target_dir):
+    """
+    대상 하나에서 실행할 명령 인자: 입력 파일은 대상 디렉터리의 복사본으로 바꾸고,
+    project_id가 있으면 --project-id 추가 (PROJECT_OVERRIDE_COMMANDS 외의 명령, 예: 사용자 생성에서는 무시)
+    """
+    resume = "--resume" in args
+    used_names = {}
+    prepared = []
+    i = 0
+    while i < len(args):
+        option, eq, value = args[i].partition("=")
+        if option in INPUT_FILE_OPTIONS and (eq or i + 1 < len(args)):
+            if not eq:
+                i += 1
+                value = args[i]
+            prepared += [option, _copy_input(value, target_dir, resume, used_names)]
+        else:
+            prepared.append(args[i])
+        i += 1
+    if target["project_id"] is not None and args[0] in PROJECT_OVERRIDE_COMMANDS:
+        prepared += ["--project-id", str(target["project_id"])]
+    return prepared
+
+def _summarize(log_path):
+    """
+    로그의 📊 요약 줄과 그 성공/실패 건수 합계
+    """
+    with open(log_path, encoding="utf-8", errors="replace") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    summaries = [line for line in lines if line.startswith("📊")]
+    succeeded = failed = 0
+    for line in summaries:
+        match = _SUMMARY_COUNTS.search(line)
+        if match:
+            succeeded += int(match.group(1))
+            failed += int(match.group(2))
+    summary = " / ".join(summaries) or (lines[-1] if lines else "")
+    return succeeded, failed, summary
+
+def run_target(target, args, target_dir, main_script):
+    """
+    대상 하나에 대해 main.py 명령을 별도 프로세스로 실행 (대상마다 세션, 커넥션 풀, throttle이 따로 생김)
+    출력은 <target_dir>/output.log에 기록, 입력은 비워 둠 (대상들이 한 터미널에서 보이지 않는 input()을 기다리지 않도록)
+    반환: REPORT_COLUMNS 형식의 결과 dict
+    """
+    env = {
+        **os.environ,
+        **target["env"],
+        "OPENPROJECT_URL": target["url"],
+        "OPENPROJECT_API_KEY": target["api_key"],
+        "PYTHONIOENCODING": "utf-8",
+    }
+    log_path = os.path.join(target_dir, "output.log")
+    started = time.monotonic()
+    with open(log_path, "w", encoding="utf-8") as log:
+        process = subprocess.run([sys.executable, main_script, *args], cwd=target_dir, env=env,
+                                 stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT)
+    seconds = round(time.monotonic() - started, 1)
+    succeeded, failed, summary = _summarize(log_path)
+    result = {
+        "target": target["name"], "url": target["url"], "project_id": target["project_id"],
+        "exit_code": process.returncode, "seconds": seconds, "succeeded": succeeded, "failed": failed,
+        "summary": summary, "log": log_path,
+    }
+    if process.returncode == 0 and not failed:
+        print(f"✅ [{target['name']}] 완료 ({seconds}초) {summary}")
+    else:
+        print(f"❌ [{target['name']}] 실패 (exit {process.returncode}, {seconds}초) {summary} - 로그: {log_path}")
+    return result
+
+def fan_out(targets, args, output_dir, main_script, parallel=None):
+    """
+    같은 명령(args, 예: ["bulk-create-work-packages", "--excel", "wp.xlsx"])을 모든 대상에 동시에 실행
+    대상마다 <output_dir>/<name>/ 디렉터리에서 실행하고 입력 파일은 그 안에 복사하므로,
+    write-back, journal(--resume), 결과 파일이 대상별로 분리됨
+    parallel: 동시에 실행할 최대 대상 수 (기본: 전체)
+    반환: 대상 순서대로 결과 dict 리스트
+    """
+    if args[0] == "fan-out":
+        raise ValueError("fan-out 안에서 fan-out을 실행할 수 없습니다.")
+    # 실행 전에 모든 대상의 입력을 준비해서, 파일 오류가 있으면 아무 대상에도 요청하지 않음
+    jobs = []
+    for target in targets:
+        target_dir = os.path.join(output_dir, target["name"])
+        os.makedirs(target_dir, exist_ok=True)
+        jobs.append((target, prepare_target_args(args, target, target_dir), target_dir))
+    print(f"🔄 {len(targets)}개 대상에 '{args[0]}' 실행")
+    return run_in_parallel(lambda job: run_target(*job, main_script), jobs, concurrency=parallel or len(jobs))
+
+def report_fan_out(results, report_file):
+    """
+    대상별 결과를 CSV로 저장하고 전체 요약 출력
+    반환: 모든 대상이 성공했으면 True
+    """
+    with open(report_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=REPORT_COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+    failed = [r["target"] for r in results if r["exit_code"] != 0 or r["failed"]]
+    slowest = max(results, key=lambda r: r["seconds"])
+    print(f"📊 fan-out: 대상 {len(results)}개 중 성공 {len(results) - len(failed)}개, 실패 {len(failed)}개 "
+          f"(가장 느린 대상 {slowest['target']} {slowest['seconds']}초, 보고서: {report_file})")
+    if failed:
+        print(f"❌ 실패한 대상: {', '.join(failed)}")
+    return not failed
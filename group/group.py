@@ -1,20 +1,39 @@
-from requester.requester import post_request
-import requests
+from requester.requester import get_request, patch_request
+from requester.collection import fetch_collection_elements
+from utils.cache import load_cache, save_cache
 
-def get_group_list(api_endpoint, headers):
+# 그룹 목록 디스크 캐시 유효 시간 (초)
+GROUP_CACHE_TTL = 3600
+
+def get_group_list(api_endpoint, headers, page_size=100, use_cache=True):
     """
-    /api/v3/groups GET: 그룹 목록 반환
+    /api/v3/groups GET: 전체 페이지를 합친 그룹 목록 반환
+    use_cache: GROUP_CACHE_TTL 이내에 조회한 목록이 디스크 캐시에 있으면 재사용
     """
-    try:
-        response = requests.get(api_endpoint, headers=headers)
-        if response.status_code == 200:
-            return response.json()  # groups 데이터
-        else:
-            print(f"❌ 그룹 목록 조회 실패: {response.status_code}")
-            return None
-    except Exception as e:
-        print(f"❌ 네트워크 오류: {e}")
+    if use_cache:
+        cached = load_cache("groups", api_endpoint, GROUP_CACHE_TTL)
+        if cached is not None:
+            return cached
+    elements = fetch_collection_elements(api_endpoint, headers, page_size=page_size, concurrency=4)
+    if elements is None:
+        print("❌ 그룹 목록 조회 실패")
+        return None
+    groups = {"total": len(elements), "count": len(elements), "_embedded": {"elements": elements}}
+    save_cache("groups", api_endpoint, groups)
+    return groups
+
+def get_group_member_ids(api_endpoint, group_id, headers):
+    """
+    /api/v3/groups/{id} GET: 현재 그룹 멤버 user id 리스트 반환 (실패 시 None)
+    """
+    response = get_request(f"{api_endpoint}/{group_id}", headers=headers)
+    if response is None:
         return None
+    if response.status_code != 200:
+        print(f"❌ 그룹(id={group_id}) 조회 실패: {response.status_code}")
+        return None
+    members = response.json().get("_links", {}).get("members", [])
+    return [int(link["href"].rstrip("/").split("/")[-1]) for link in members if link.get("href")]
 
 def update_group_members(api_endpoint, group_id, user_ids, headers, group_name=None):
     """
@@ -27,12 +46,42 @@ def update_group_members(api_endpoint, group_id, user_ids, headers, group_name=N
     data = {"_links": {"members": members_links}}
     if group_name:
         data["name"] = group_name
-    try:
-        response = requests.patch(url, headers=headers, json=data)
-        return response
-    except Exception as e:
-        print(f"❌ 네트워크 오류: {e}")
-        return None
+    return patch_request(url, data, headers)
+
+def change_group_members(api_endpoint, group_ids, user_ids, headers, remove=False):
+    """
+    여러 그룹에 사용자 추가(remove=True면 제거)
+    그룹마다 현재 멤버를 한 번 조회해 합집합/차집합을 계산하고, 변경이 있을 때만 PATCH 한 번 전송
+    반환: {group_id: PATCH response, None(변경 없음) 또는 False(멤버 조회 실패/응답 없음)} (failed_group_ids 참고)
+    """
+    user_ids = set(user_ids)
+    results = {}
+    for group_id in group_ids:
+        current = get_group_member_ids(api_endpoint, group_id, headers)
+        if current is None:
+            results[group_id] = False
+            continue
+        if remove:
+            members = [uid for uid in current if uid not in user_ids]
+        else:
+            members = current + sorted(user_ids - set(current))
+        if len(members) == len(current):
+            print(f"ℹ️ 그룹(id={group_id}) 멤버 변경 없음")
+            results[group_id] = None
+            continue
+        response = update_group_members(api_endpoint, group_id, members, headers)
+        if response is not None and response.status_code in (200, 204):
+            print(f"✅ 그룹(id={group_id}) 멤버 {'제거' if remove else '추가'} 성공! ({len(current)} → {len(members)}명)")
+        else:
+            print(f"❌ 그룹(id={group_id}) 멤버 변경 실패: {response.status_code if response is not None else 'No Response'}")
+        results[group_id] = response if response is not None else False
+    return results
+
+def failed_group_ids(results):
+    """
+    change_group_members 결과에서 실패한 group id 리스트
+    """
+    return [gid for gid, resp in results.items() if resp is False or (resp is not None and resp.status_code not in (200, 204))]
 
 def print_group_list_with_index(groups):
     """
@@ -42,4 +91,4 @@ def print_group_list_with_index(groups):
         print("그룹 데이터가 없습니다.")
         return
     for idx, group in enumerate(groups["_embedded"]["elements"], 1):
-        print(f"{idx}. {group['name']} (id: {group['id']})") 
\ No newline at end of file
+        print(f"{idx}. {group['name']} (id: {group['id']})")
@@ -0,0 +1,94 @@
+# export에 추가하는 계층 컬럼 (order_by_hierarchy 참고)
+HIERARCHY_COLUMNS = ["depth", "root_id", "outline", "subtree_start_date", "subtree_due_date", "hierarchy_issue"]
+
+def _key(value):
+    """
+    id 값을 비교용 문자열로 정규화 (12, 12.0, "12"는 모두 "12", 비어 있으면 None)
+    """
+    if value is None or value != value:
+        return None
+    try:
+        return str(int(value))
+    except (TypeError, ValueError):
+        return str(value)
+
+def _date(value):
+    return None if value is None or value != value else value
+
+def _min(a, b):
+    return b if a is None or (b is not None and b < a) else a
+
+def _max(a, b):
+    return b if a is None or (b is not None and b > a) else a
+
+def order_by_hierarchy(rows):
+    """
+    work_package_id / parent_id로 부모→자식 index를 한 번에 만들어 행을 depth-first 순서로 정렬하고 계층 컬럼 추가
+    (행 dict에 직접 추가, API 요청 없음)
+    - depth: 최상위 0, root_id: 최상위 조상 id, outline: 1.2.3 형식 번호
+    - subtree_start_date / subtree_due_date: 자신과 모든 하위 항목의 가장 빠른 start_date / 가장 늦은 due_date
+    - hierarchy_issue: "orphan"(부모가 목록에 없음, 최상위로 취급) 또는 "cycle"(순환 참조 또는 그 하위, 맨 뒤에 입력 순서로 배치)
+    반환: 정렬된 행 리스트
+    """
+    index = {}
+    for pos, row in enumerate(rows):
+        index.setdefault(_key(row.get("work_package_id")), pos)
+
+    parents = [None] * len(rows)
+    children = {}
+    roots = []
+    for pos, row in enumerate(rows):
+        parent_key = _key(row.get("parent_id"))
+        row["hierarchy_issue"] = None
+        if parent_key is None:
+            roots.append(pos)
+        elif parent_key not in index:
+            row["hierarchy_issue"] = "orphan"
+            roots.append(pos)
+        else:
+            parents[pos] = index[parent_key]
+            children.setdefault(index[parent_key], []).append(pos)
+
+    ordered = []
+    visited = [False] * len(rows)
+    for number, root in enumerate(roots, 1):
+        root_id = rows[root].get("work_package_id")
+        stack = [(root, 0, str(number))]
+        while stack:
+            pos, depth, outline = stack.pop()
+            visited[pos] = True
+            ordered.append(pos)
+            row = rows[pos]
+            row["depth"] = depth
+            row["root_id"] = root_id
+            row["outline"] = outline
+            row["subtree_start_date"] = _date(row.get("start_date"))
+            row["subtree_due_date"] = _date(row.get("due_date"))
+            kids = children.get(pos, [])
+            for i in range(len(kids) - 1, -1, -1):
+                stack.append((kids[i], depth + 1, f"{outline}.{i + 1}"))
+
+    # preorder의 역순이면 자식이 항상 부모보다 먼저 처리됨
+    for pos in reversed(ordered):
+        parent = parents[pos]
+        if parent is not None:
+            row, parent_row = rows[pos], rows[parent]
+            parent_row["subtree_start_date"] = _min(parent_row["subtree_start_date"], row["subtree_start_date"])
+            parent_row["subtree_due_date"] = _max(parent_row["subtree_due_date"], row["subtree_due_date"])
+
+    for pos, row in enumerate(rows):
+        if not visited[pos]:
+            row.update(depth=None, root_id=None, outline=None, subtree_start_date=None, subtree_due_date=None, hierarchy_issue="cycle")
+            ordered.append(pos)
+    return [rows[pos] for pos in ordered]
+
+def report_hierarchy_issues(rows):
+    """
+    order_by_hierarchy 결과의 orphan / cycle 건수 출력
+    """
+    orphans = sum(1 for row in rows if row.get("hierarchy_issue") == "orphan")
+    cycles = sum(1 for row in rows if row.get("hierarchy_issue") == "cycle")
+    if orphans:
+        print(f"⚠️ 부모가 목록에 없는 work package {orphans}건 (최상위로 배치, hierarchy_issue=orphan)")
+    if cycles:
+        print(f"⚠️ parent 순환 참조(또는 그 하위) work package {cycles}건 (맨 뒤에 배치, hierarchy_issue=cycle)")
@@ -0,0 +1,61 @@
+import json
+import os
+import threading
+import time
+
+class Journal:
+    """
+    bulk 작업의 행별 결과를 JSONL 파일에 즉시 추가 기록하는 write-ahead journal
+    한 줄: {"key": 행 키, "status": HTTP 상태, "id": 생성/수정된 id, "lock_version": ..., "at": 기록 시각}
+    같은 키가 여러 번 기록되면 마지막 기록이 유효함
+    """
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.entries = {}
+        if resume and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 기록 도중 중단된 마지막 줄은 무시
+                        continue
+                    self.entries[entry["key"]] = entry
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def completed(self, key, success_codes=(200, 201)):
+        """
+        key 행이 이전 실행에서 성공했으면 해당 기록, 아니면 None
+        """
+        entry = self.entries.get(str(key))
+        # ok가 없는 이전 형식의 기록은 상태 코드로 판단
+        if entry is not None and entry.get("ok", entry.get("status") in success_codes):
+            return entry
+        return None
+
+    def record(self, key, result):
+        """
+        행 결과(results.RowResult)를 journal에 한 줄 추가
+        """
+        entry = {"key": str(key), "ok": result.ok, "status": result.status, "id": result.id, "lock_version": result.lock_version, "at": time.time()}
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            self.entries[entry["key"]] = entry
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+def open_journal(path, resume=False):
+    """
+    journal 열기 (resume=False면 새로 시작)
+    """
+    return Journal(path, resume=resume)
+
+def default_journal_path(input_file):
+    return f"{input_file}.journal.jsonl"
@@ -1,25 +1,55 @@
 import os
 import typer
+from typing import List
 from dotenv import load_dotenv
 from auth.auth import get_auth_headers
+from requester.requester import configure_session, DEFAULT_POOL_SIZE, DEFAULT_TIMEOUT
+from requester.throttle import DEFAULT_MAX_RETRIES
 from users.create_user import create_user, bulk_create_users
-from workpackages.create_work_package import create_work_package, bulk_create_work_packages, bulk_patch_work_package_parents
+from group.group import change_group_members, failed_group_ids
+from workpackages.create_work_package import create_work_package, bulk_create_work_package_rows, bulk_patch_work_package_parents
 from datetime import datetime
 from endpoints.endpoints import get_user_endpoint, get_group_endpoint, get_work_package_endpoint
 from payloads.user_payloads import build_user_payload
 from payloads.work_package_payload import build_work_package_payload
-from utils.excel_utils import read_work_packages_from_excel, read_parent_patch_from_excel
-from workpackages.get_work_packages import export_work_packages_to_excel
+from journal.journal import open_journal, default_journal_path
+from metrics.metrics import METRICS_FORMATS, enable_metrics, report_metrics, phase
+# pandas/openpyxl을 쓰는 모듈(utils.excel_utils, utils.export_sinks, validation, metadata, mirror)은
+# 단건 명령의 시작 시간을 줄이기 위해 필요한 명령 안에서 import
 
-def get_env():
+def get_env(min_pool_size=None):
     load_dotenv()
     openproject_url = os.getenv("OPENPROJECT_URL")
     api_key = os.getenv("OPENPROJECT_API_KEY")
     headers = get_auth_headers(api_key)
+    pool_size = int(os.getenv("OPENPROJECT_POOL_SIZE", DEFAULT_POOL_SIZE))
+    if min_pool_size:
+        pool_size = max(pool_size, min_pool_size)
+    timeout = float(os.getenv("OPENPROJECT_TIMEOUT")) if os.getenv("OPENPROJECT_TIMEOUT") else DEFAULT_TIMEOUT
+    max_retries = int(os.getenv("OPENPROJECT_MAX_RETRIES", DEFAULT_MAX_RETRIES))
+    configure_session(headers=headers, pool_size=pool_size, timeout=timeout, max_retries=max_retries)
     return openproject_url, headers
 
 app = typer.Typer()
 
+@app.callback()
+def main_callback(
+    ctx: typer.Context,
+    metrics: str = typer.Option(None, help=f"Print a request/phase metrics report at the end ({'/'.join(METRICS_FORMATS)})"),
+    metrics_file: str = typer.Option(None, help="Write the metrics report to this file instead of printing it"),
+    profile: bool = typer.Option(False, help="Also cProfile/tracemalloc the local phases (Excel read, payload build, Excel write)")
+):
+    """OpenProject bulk import/export CLI"""
+    if metrics is None and (metrics_file or profile):
+        metrics = "text"
+    if metrics is None:
+        return
+    if metrics not in METRICS_FORMATS:
+        print(f"❌ 지원하지 않는 metrics 형식: {metrics}")
+        raise typer.Exit(1)
+    enable_metrics(profile=profile)
+    ctx.call_on_close(lambda: report_metrics(metrics, metrics_file))
+
 @app.command("create-user")
 def create_user_cmd(
     login: str = typer.Option(..., help="User login"),
@@ -39,39 +69,54 @@ def create_user_cmd(
         print("✅ 사용자 생성 성공!")
         user_id = response.json().get("id")
         if group_id and user_id:
-            from group.group import update_group_members
-            group_update_resp = update_group_members(group_api_endpoint, group_id, [user_id], headers)
-            if group_update_resp is not None and group_update_resp.status_code in (200, 204):
-                print(f"✅ 그룹(id={group_id})에 사용자 추가 성공!")
-            else:
-                print(f"❌ 그룹에 사용자 추가 실패: {group_update_resp.status_code if group_update_resp is not None else 'No Response'}")
+            change_group_members(group_api_endpoint, [group_id], [user_id], headers)
     else:
         print(f"❌ 사용자 생성 실패: {response.status_code if response is not None else 'No Response'}")
 
 @app.command("bulk-create-users")
 def bulk_create_users_cmd(
     excel: str = typer.Option(..., help="Path to Excel file"),
-    group_id: int = typer.Option(None, help="Group ID to add users to (optional)")
+    group_id: List[int] = typer.Option(None, help="Group ID to add users to (optional, repeatable)"),
+    journal: str = typer.Option(None, help="Journal file (default: <excel>.journal.jsonl)"),
+    resume: bool = typer.Option(False, help="Skip rows already completed in the journal"),
+    validate_only: bool = typer.Option(False, help="Only run the offline pre-flight validation"),
+    report: str = typer.Option(None, help="Write the validation errors to this CSV file"),
+    concurrency: int = typer.Option(1, help="Number of users to create in parallel"),
+    skip_existing: bool = typer.Option(True, help="Prefetch existing users, skip rows whose login already exists and fail rows whose email belongs to another login")
 ):
-    """Create multiple users from Excel (optionally add to group)"""
-    openproject_url, headers = get_env()
+    """Create multiple users from Excel (optionally add to groups)"""
+    openproject_url, headers = get_env(min_pool_size=concurrency)
     api_endpoint = get_user_endpoint(openproject_url)
     group_api_endpoint = get_group_endpoint(openproject_url)
-    # group_id가 있으면 group_api_endpoint를 넘기고, 없으면 기존 로직(선택) 유지
-    if group_id:
-        # group_id를 바로 넘기기 위해 bulk_create_users를 약간 수정해야 할 수도 있음
-        # 여기서는 group_id를 넘기고, 내부에서 바로 추가하도록 처리
-        bulk_create_users(api_endpoint, headers, excel, group_api_endpoint=group_api_endpoint, force_group_id=group_id)
-    else:
-        bulk_create_users(api_endpoint, headers, excel, group_api_endpoint=group_api_endpoint)
+    if validate_only:
+        bulk_create_users(api_endpoint, headers, excel, validate_only=True, report_file=report)
+        return
+    run_journal = open_journal(journal or default_journal_path(excel), resume=resume)
+    try:
+        # group_id가 없으면 그룹 목록에서 선택
+        bulk_create_users(api_endpoint, headers, excel, group_api_endpoint=group_api_endpoint, group_ids=group_id, journal=run_journal, report_file=report, concurrency=concurrency, skip_existing=skip_existing)
+    finally:
+        run_journal.close()
+
+@app.command("group-members")
+def group_members_cmd(
+    group_id: List[int] = typer.Option(..., help="Group ID (repeatable)"),
+    user_id: List[int] = typer.Option(..., help="User ID (repeatable)"),
+    remove: bool = typer.Option(False, help="Remove the users instead of adding them")
+):
+    """Add users to (or remove them from) one or more groups"""
+    openproject_url, headers = get_env()
+    results = change_group_members(get_group_endpoint(openproject_url), group_id, user_id, headers, remove=remove)
+    if failed_group_ids(results):
+        raise typer.Exit(1)
 
 @app.command("create-work-package")
 def create_work_package_cmd(
     subject: str = typer.Option(..., help="Work package subject"),
     project_id: int = typer.Option(..., help="Project ID (e.g., 3)"),
-    type_id: int = typer.Option(1, help="Type ID (e.g., 1 for Task)"),
-    status_id: int = typer.Option(1, help="Status ID (e.g., 1 for New)"),
-    priority_id: int = typer.Option(9, help="Priority ID (e.g., 9 for Normal)"),
+    type_id: int = typer.Option(None, help="Type ID (default: the instance's default type)"),
+    status_id: int = typer.Option(None, help="Status ID (default: the instance's default status)"),
+    priority_id: int = typer.Option(None, help="Priority ID (default: the instance's default priority)"),
     author_id: int = typer.Option(..., help="Author user ID"),
     assignee_id: int = typer.Option(None, help="Assignee user ID (optional)"),
     category_id: int = typer.Option(None, help="Category ID (optional)"),
@@ -82,6 +127,12 @@ def create_work_package_cmd(
     """Create a single work package"""
     openproject_url, headers = get_env()
     api_endpoint = get_work_package_endpoint(openproject_url)
+    if None in (type_id, status_id, priority_id):
+        from metadata.metadata import DEFAULT_SECTIONS, load_metadata, work_package_defaults
+        defaults = work_package_defaults(load_metadata(openproject_url, headers, sections=DEFAULT_SECTIONS))
+        type_id = type_id or defaults["type_id"]
+        status_id = status_id or defaults["status_id"]
+        priority_id = priority_id or defaults["priority_id"]
 
     payload = build_work_package_payload(
         subject=subject,
@@ -107,66 +158,305 @@ def create_work_package_cmd(
             print(response.text)
 
 @app.command("bulk-create-work-packages")
-def bulk_create_work_packages_cmd():
-    """Create multiple work packages from workpackages.xlsx"""
-    openproject_url, headers = get_env()
+def bulk_create_work_packages_cmd(
+    concurrency: int = typer.Option(1, help="Number of work packages to create in parallel"),
+    excel: str = typer.Option("workpackages.xlsx", help="Path to Excel (or .csv/.parquet) file"),
+    journal: str = typer.Option(None, help="Journal file (default: <excel>.journal.jsonl)"),
+    resume: bool = typer.Option(False, help="Skip rows already completed in the journal"),
+    refresh_metadata: bool = typer.Option(False, help="Refetch types/statuses/priorities/categories/users instead of using the cache"),
+    validate_only: bool = typer.Option(False, help="Only run the offline pre-flight validation"),
+    report: str = typer.Option(None, help="Write the validation errors to this CSV file"),
+    project_id: int = typer.Option(None, help="Create every row in this project instead of the sheet's project_id column")
+):
+    """Create multiple work packages from workpackages.xlsx (parents before children)"""
+    from utils.excel_utils import read_work_packages_from_excel, apply_work_package_defaults
+    from validation.validation import validate_work_packages, report_validation_errors
+    from metadata.metadata import METADATA_SECTIONS, DEFAULT_SECTIONS, load_metadata, uses_names, work_package_defaults, resolve_work_package_rows
+    openproject_url, headers = get_env(min_pool_size=concurrency)
     api_endpoint = get_work_package_endpoint(openproject_url)
-    excel_file = "workpackages.xlsx"
+    excel_file = excel
     try:
-        work_packages_data = read_work_packages_from_excel(excel_file)
+        with phase("excel_read"):
+            work_packages_data = read_work_packages_from_excel(excel_file, apply_defaults=False, project_id=project_id)
     except Exception as e:
         print(f"❌ Excel 파일 읽기 오류: {e}")
         return
-    payloads = [
-        build_work_package_payload(
-            subject=wp["subject"],
-            project_id=wp["project_id"],
-            type_id=wp.get("type_id", 1),
-            status_id=wp.get("status_id", 1),
-            priority_id=wp.get("priority_id", 9),
-            author_id=wp["author_id"],
-            assignee_id=wp.get("assignee_id"),
-            category_id=wp.get("category_id"),
-            start_date=wp.get("start_date"),
-            due_date=wp.get("due_date"),
-            description=wp.get("description", "")
-        ) for wp in work_packages_data
-    ]
-    responses = bulk_create_work_packages(api_endpoint, headers, payloads, excel_file=excel_file)
-    for idx, resp in enumerate(responses):
-        if resp is not None and resp.status_code == 201:
-            print(f"✅ {idx+1}번째 Work package 생성 성공!")
-        else:
-            print(f"❌ {idx+1}번째 Work package 생성 실패: {resp.status_code if resp is not None else 'No Response'}")
-            if resp is not None:
-                print(resp.text)
+    # 네트워크 요청 전에 시트 전체 검증
+    with phase("validation"):
+        errors = validate_work_packages(work_packages_data)
+    if not report_validation_errors(errors, report) or validate_only:
+        return
+    # 비어 있는 type/status/priority는 이름 컬럼이 없어도 인스턴스 기본값(isDefault)으로 채움
+    names = uses_names(work_packages_data)
+    category_projects = [wp["project_id"] for wp in work_packages_data if wp.get("category") is not None]
+    metadata = load_metadata(openproject_url, headers, project_ids=category_projects, use_cache=not refresh_metadata,
+                             sections=METADATA_SECTIONS if names else DEFAULT_SECTIONS)
+    defaults = work_package_defaults(metadata)
+    if names:
+        # 이름(Task, In progress, login 등)을 인스턴스의 id로 변환
+        try:
+            resolve_work_package_rows(work_packages_data, metadata, defaults)
+        except ValueError as e:
+            print(f"❌ 이름 변환 오류:\n{e}")
+            return
+    else:
+        apply_work_package_defaults(work_packages_data, defaults)
+    run_journal = open_journal(journal or default_journal_path(excel_file), resume=resume)
+    try:
+        bulk_create_work_package_rows(api_endpoint, headers, work_packages_data, excel_file=excel_file, concurrency=concurrency, journal=run_journal)
+    except ValueError as e:
+        print(f"❌ 계층 구조 오류: {e}")
+        return
+    finally:
+        run_journal.close()
+
+@app.command("stream-create-work-packages")
+def stream_create_work_packages_cmd(
+    input: List[str] = typer.Option(..., help="Input file (xlsx/csv/parquet, file.xlsx#Sheet for a sheet), repeatable"),
+    concurrency: int = typer.Option(8, help="Number of work packages to create in parallel"),
+    chunk_size: int = typer.Option(1000, help="Rows read and prepared per chunk"),
+    workers: int = typer.Option(1, help="Processes used to read several inputs at once"),
+    journal: str = typer.Option(None, help="Journal file (default: <first input>.journal.jsonl)"),
+    resume: bool = typer.Option(False, help="Skip rows already completed in the journal"),
+    results: str = typer.Option(None, help="Per-row result CSV (default: <input>.results.csv, stream.results.csv for several inputs)"),
+    refresh_metadata: bool = typer.Option(False, help="Refetch types/statuses/priorities/categories/users instead of using the cache"),
+    project_id: int = typer.Option(None, help="Create every row in this project instead of the sheet's project_id column")
+):
+    """Create work packages from large flat sheets, sending while the file is still being read (see README for how this differs from bulk-create-work-packages)"""
+    from pipeline.pipeline import stream_create_work_packages, default_results_path
+    openproject_url, headers = get_env(min_pool_size=concurrency)
+    run_journal = open_journal(journal or default_journal_path(input[0]), resume=resume)
+    try:
+        _, failed = stream_create_work_packages(
+            openproject_url, headers, input, concurrency=concurrency, chunk_size=chunk_size, workers=workers,
+            journal=run_journal, results_file=results or default_results_path(input), use_metadata_cache=not refresh_metadata,
+            project_id=project_id,
+        )
+    finally:
+        run_journal.close()
+    if failed:
+        raise typer.Exit(1)
+
+@app.command("stream-create-users")
+def stream_create_users_cmd(
+    input: List[str] = typer.Option(..., help="Input file (xlsx/csv/parquet, file.xlsx#Sheet for a sheet), repeatable"),
+    group_id: List[int] = typer.Option(None, help="Group ID to add the users to when all rows are done (optional, repeatable)"),
+    concurrency: int = typer.Option(8, help="Number of users to create in parallel"),
+    chunk_size: int = typer.Option(1000, help="Rows read and prepared per chunk"),
+    workers: int = typer.Option(1, help="Processes used to read several inputs at once"),
+    journal: str = typer.Option(None, help="Journal file (default: <first input>.journal.jsonl)"),
+    resume: bool = typer.Option(False, help="Skip rows already completed in the journal"),
+    results: str = typer.Option(None, help="Per-row result CSV (default: <input>.results.csv, stream.results.csv for several inputs)"),
+    skip_existing: bool = typer.Option(True, help="Prefetch existing users, skip rows whose login already exists and fail rows whose email belongs to another login")
+):
+    """Create users from large sheets, sending while the file is still being read (see README for how this differs from bulk-create-users)"""
+    from pipeline.pipeline import stream_create_users, default_results_path
+    openproject_url, headers = get_env(min_pool_size=concurrency)
+    run_journal = open_journal(journal or default_journal_path(input[0]), resume=resume)
+    try:
+        _, failed = stream_create_users(
+            openproject_url, headers, input, group_ids=group_id, concurrency=concurrency, chunk_size=chunk_size, workers=workers,
+            journal=run_journal, results_file=results or default_results_path(input), skip_existing=skip_existing,
+        )
+    finally:
+        run_journal.close()
+    if failed:
+        raise typer.Exit(1)
+
+@app.command("stream-patch-work-package-parents")
+def stream_patch_work_package_parents_cmd(
+    input: List[str] = typer.Option(..., help="Input file with work_package_id, lock_version, parent_id (xlsx/csv/parquet, file.xlsx#Sheet), repeatable"),
+    concurrency: int = typer.Option(8, help="Number of patches to send in parallel"),
+    conflict_retries: int = typer.Option(0, help="Retry 409 conflicts this many times at the end, after refreshing their lockVersions in batches"),
+    chunk_size: int = typer.Option(1000, help="Rows read and prepared per chunk"),
+    workers: int = typer.Option(1, help="Processes used to read several inputs at once"),
+    journal: str = typer.Option(None, help="Journal file (default: <first input>.journal.jsonl)"),
+    resume: bool = typer.Option(False, help="Skip patches already completed in the journal"),
+    results: str = typer.Option(None, help="Per-row result CSV (default: <input>.results.csv, stream.results.csv for several inputs)")
+):
+    """Patch work package parents from large sheets, sending while the file is still being read (see README for how this differs from bulk-patch-work-package-parents)"""
+    from pipeline.pipeline import stream_patch_work_package_parents, default_results_path
+    openproject_url, headers = get_env(min_pool_size=concurrency)
+    run_journal = open_journal(journal or default_journal_path(input[0]), resume=resume)
+    try:
+        _, failed = stream_patch_work_package_parents(
+            openproject_url, headers, input, concurrency=concurrency, chunk_size=chunk_size, workers=workers,
+            journal=run_journal, results_file=results or default_results_path(input), conflict_retries=conflict_retries,
+        )
+    finally:
+        run_journal.close()
+    if failed:
+        raise typer.Exit(1)
 
 @app.command("bulk-patch-work-package-parents")
 def bulk_patch_work_package_parents_cmd(
-    excel: str = typer.Option("parent_patches.xlsx", help="Path to Excel file with parent patch info")
+    excel: str = typer.Option("parent_patches.xlsx", help="Path to Excel file with parent patch info"),
+    concurrency: int = typer.Option(1, help="Number of patches to send in parallel"),
+    conflict_retries: int = typer.Option(0, help="Retry 409 conflicts this many times after refreshing their lockVersion"),
+    journal: str = typer.Option(None, help="Journal file (default: <excel>.journal.jsonl)"),
+    resume: bool = typer.Option(False, help="Skip patches already completed in the journal"),
+    validate_only: bool = typer.Option(False, help="Only run the offline pre-flight validation"),
+    report: str = typer.Option(None, help="Write the validation errors to this CSV file")
 ):
     """Bulk patch work package parents from Excel (work_package_id, lock_version, parent_id)"""
-    openproject_url, headers = get_env()
+    from utils.excel_utils import read_parent_patch_from_excel
+    from validation.validation import validate_parent_patches, report_validation_errors
+    openproject_url, headers = get_env(min_pool_size=concurrency)
     try:
-        parent_patches = read_parent_patch_from_excel(excel)
+        with phase("excel_read"):
+            parent_patches = read_parent_patch_from_excel(excel)
     except Exception as e:
         print(f"❌ Excel 파일 읽기 오류: {e}")
         return
-    responses = bulk_patch_work_package_parents(openproject_url, headers, parent_patches)
-    for idx, resp in enumerate(responses):
-        patch = parent_patches[idx]
-        if resp is not None and resp.status_code in (200, 201):
-            print(f"✅ {idx+1}번째 parent patch 성공 (work_package_id={patch['work_package_id']})!")
-        else:
-            print(f"❌ {idx+1}번째 parent patch 실패 (work_package_id={patch['work_package_id']}): {resp.status_code if resp is not None else 'No Response'}")
-            if resp is not None:
-                print(resp.text)
+    # 네트워크 요청 전에 시트 전체 검증
+    with phase("validation"):
+        errors = validate_parent_patches(parent_patches)
+    if not report_validation_errors(errors, report) or validate_only:
+        return
+    run_journal = open_journal(journal or default_journal_path(excel), resume=resume)
+    try:
+        bulk_patch_work_package_parents(openproject_url, headers, parent_patches, concurrency=concurrency, conflict_retries=conflict_retries, journal=run_journal)
+    finally:
+        run_journal.close()
+
+@app.command("bulk-update-work-packages")
+def bulk_update_work_packages_cmd(
+    excel: str = typer.Option("workpackages.xlsx", help="Edited export (xlsx/csv/parquet) with work_package_id and the columns to update"),
+    concurrency: int = typer.Option(1, help="Number of patches to send in parallel"),
+    conflict_retries: int = typer.Option(0, help="Retry 409 conflicts of rows without a lock_version this many times after refreshing their lockVersion"),
+    from_mirror: str = typer.Option(None, help="Compare against a local mirror (see `sync`) instead of fetching the current state"),
+    validate_only: bool = typer.Option(False, help="Only run the offline pre-flight validation"),
+    report: str = typer.Option(None, help="Write the validation errors to this CSV file")
+):
+    """Update work packages from an edited export, sending only the fields that changed"""
+    from utils.excel_utils import read_work_package_updates_from_excel
+    from validation.validation import validate_work_package_updates, report_validation_errors
+    from workpackages.get_work_packages import fetch_work_packages_by_id
+    from workpackages.update_work_package import bulk_update_work_packages
+    from mirror.mirror import load_mirror_work_packages
+    openproject_url, headers = get_env(min_pool_size=concurrency)
+    try:
+        with phase("excel_read"):
+            updates = read_work_package_updates_from_excel(excel)
+    except Exception as e:
+        print(f"❌ Excel 파일 읽기 오류: {e}")
+        return
+    # 네트워크 요청 전에 시트 전체 검증
+    with phase("validation"):
+        errors = validate_work_package_updates(updates)
+    if not report_validation_errors(errors, report) or validate_only:
+        return
+    ids = [update["work_package_id"] for update in updates]
+    if from_mirror:
+        current = load_mirror_work_packages(from_mirror, ids)
+    else:
+        failed_ids = []
+        current = fetch_work_packages_by_id(openproject_url, headers, ids, concurrency=max(concurrency, 4), failed_ids=failed_ids)
+        if failed_ids:
+            # 받지 못한 행을 "서버에 없음"으로 처리하지 않도록 수정 전에 중단
+            print(f"❌ work package {len(failed_ids)}개의 현재 상태 조회 실패: 아무것도 수정하지 않았습니다. 다시 실행하세요.")
+            raise typer.Exit(1)
+    results, missing = bulk_update_work_packages(openproject_url, headers, updates, current, concurrency=concurrency, conflict_retries=conflict_retries)
+    for wp_id in missing:
+        print(f"❌ work_package_id={wp_id}: 서버(또는 미러)에 없습니다.")
+    if missing or not all(result.ok for result in results):
+        raise typer.Exit(1)
 
 @app.command("export-work-packages")
-def export_work_packages_cmd():
-    """Export all work packages to workpackages.xlsx"""
+def export_work_packages_cmd(
+    concurrency: int = typer.Option(4, help="Number of pages to fetch in parallel"),
+    export_format: str = typer.Option("xlsx", "--format", help="Output format (xlsx/csv/parquet)"),
+    output: str = typer.Option(None, help="Output file (default: workpackages.<format>)"),
+    from_mirror: str = typer.Option(None, help="Read from a local mirror database (see `sync`) instead of the API"),
+    project_id: List[int] = typer.Option(None, help="Only work packages in this project (repeatable)"),
+    status: List[str] = typer.Option(None, help="Only this status id (repeatable), or 'open' / 'closed' (default: all statuses, open and closed)"),
+    type_id: List[int] = typer.Option(None, help="Only this type id (repeatable)"),
+    assignee_id: List[str] = typer.Option(None, help="Only this assignee user id (repeatable, 'me' for yourself)"),
+    updated_since: str = typer.Option(None, help="Only work packages updated on or after this date (YYYY-MM-DD or ISO 8601)"),
+    hierarchy: bool = typer.Option(False, help="Order rows depth-first and add depth/root_id/outline/subtree date columns")
+):
+    """Export all work packages (open and closed unless --status is given) to workpackages.xlsx (or .csv/.parquet)"""
+    from utils.export_sinks import EXPORT_FORMATS
+    from workpackages.get_work_packages import export_work_packages, build_work_package_filters
+    from mirror.mirror import export_from_mirror
+    if export_format not in EXPORT_FORMATS:
+        print(f"❌ 지원하지 않는 형식: {export_format}")
+        raise typer.Exit(1)
+    try:
+        filters = build_work_package_filters(project_id, status, type_id, assignee_id, updated_since)
+    except ValueError as e:
+        print(f"❌ {e}")
+        raise typer.Exit(1)
+    if from_mirror and filters:
+        print("❌ --from-mirror와 필터 옵션은 함께 사용할 수 없습니다.")
+        raise typer.Exit(1)
+    output_file = output or f"workpackages.{export_format}"
+    try:
+        if from_mirror:
+            export_from_mirror(from_mirror, output_file, export_format=export_format, hierarchy=hierarchy)
+        else:
+            openproject_url, headers = get_env(min_pool_size=concurrency)
+            exported = export_work_packages(openproject_url, headers, output_file=output_file, export_format=export_format, concurrency=concurrency, filters=filters, hierarchy=hierarchy)
+            if exported is None:
+                raise typer.Exit(1)
+    except ImportError as e:
+        print(f"❌ {e}")
+        raise typer.Exit(1)
+
+@app.command("sync")
+def sync_cmd(
+    db: str = typer.Option("workpackages.db", help="Path to the local SQLite mirror"),
+    concurrency: int = typer.Option(4, help="Number of pages to fetch in parallel"),
+    full: bool = typer.Option(False, help="Refetch everything and remove work packages that were deleted or are no longer visible")
+):
+    """Sync work packages changed since the last run into a local SQLite mirror (deletions are only picked up by --full)"""
+    from mirror.mirror import sync_mirror
+    openproject_url, headers = get_env(min_pool_size=concurrency)
+    if sync_mirror(openproject_url, headers, db, concurrency=concurrency, full=full) is None:
+        raise typer.Exit(1)
+
+@app.command("run-batch")
+def run_batch_cmd(
+    input: str = typer.Option(..., help="JSONL file of operations (create-user, create-work-package, patch-parent, group-members), or - for stdin"),
+    output: str = typer.Option(None, help="JSONL result file (default: <input>.results.jsonl, batch.results.jsonl for stdin)"),
+    project_id: int = typer.Option(None, help="Use this project for every create-work-package operation")
+):
+    """Run a JSONL stream of operations in one process with one authenticated session"""
+    import sys
+    from batch.batch import run_batch
     openproject_url, headers = get_env()
-    export_work_packages_to_excel(openproject_url, headers)
+    output_file = output or ("batch.results.jsonl" if input == "-" else f"{os.path.splitext(input)[0]}.results.jsonl")
+    source = sys.stdin if input == "-" else open(input, encoding="utf-8")
+    try:
+        with open(output_file, "w", encoding="utf-8") as out:
+            succeeded, failed = run_batch(openproject_url, headers, source, out, project_id=project_id)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+    print(f"📊 batch 완료: 성공 {succeeded}건, 실패 {failed}건 (결과: {output_file})")
+    if failed:
+        raise typer.Exit(1)
+
+@app.command("fan-out", context_settings={"allow_extra_args": True, "ignore_unknown_options": True})
+def fan_out_cmd(
+    ctx: typer.Context,
+    targets: str = typer.Option(..., help="JSON file listing the targets (name, url, api_key or api_key_env, project_id, env)"),
+    output_dir: str = typer.Option("rollout", help="Directory for per-target input copies, logs, journals and the combined report"),
+    parallel: int = typer.Option(None, help="Maximum number of targets run at once (default: all)")
+):
+    """Run one command against every target at the same time, e.g. fan-out --targets targets.json -- bulk-create-work-packages --excel wp.xlsx"""
+    from fanout.fanout import load_targets, fan_out, report_fan_out
+    if not ctx.args:
+        print("❌ 실행할 명령이 없습니다 (예: fan-out --targets targets.json -- bulk-create-work-packages --excel wp.xlsx)")
+        raise typer.Exit(1)
+    try:
+        target_list = load_targets(targets)
+        results = fan_out(target_list, ctx.args, output_dir, os.path.abspath(__file__), parallel=parallel)
+    except (OSError, ValueError) as e:
+        print(f"❌ fan-out 오류: {e}")
+        raise typer.Exit(1)
+    if not report_fan_out(results, os.path.join(output_dir, "report.csv")):
+        raise typer.Exit(1)
 
 if __name__ == "__main__":
     app()
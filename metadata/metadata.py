@@ -0,0 +1,155 @@
+from requester.parallel import run_in_parallel
+from requester.collection import fetch_collection_elements
+from utils.cache import load_cache, save_cache
+from utils.excel_utils import WORK_PACKAGE_DEFAULTS
+from endpoints.endpoints import (
+    get_types_endpoint, get_statuses_endpoint, get_priorities_endpoint,
+    get_project_categories_endpoint, get_user_endpoint,
+)
+
+# 메타데이터 디스크 캐시 유효 시간 (초)
+METADATA_CACHE_TTL = 6 * 3600
+
+# load_metadata가 조회하는 섹션 (categories는 프로젝트별로 따로 조회)
+METADATA_SECTIONS = ("types", "statuses", "priorities", "users")
+# 기본값(isDefault)만 필요할 때 조회하는 섹션 (이름 컬럼이 없는 시트)
+DEFAULT_SECTIONS = ("types", "statuses", "priorities")
+
+# 이름 컬럼 → (id 컬럼, 메타데이터 섹션)
+NAME_COLUMNS = {
+    "type": ("type_id", "types"),
+    "status": ("status_id", "statuses"),
+    "priority": ("priority_id", "priorities"),
+    "category": ("category_id", "categories"),
+    "author": ("author_id", "users"),
+    "assignee": ("assignee_id", "users"),
+}
+
+def _normalize(name):
+    return str(name).strip().lower()
+
+def _name_lookup(elements):
+    """
+    {정규화된 이름: id} 와 기본값(isDefault) id 반환
+    """
+    lookup = {_normalize(e["name"]): e["id"] for e in elements if e.get("name") is not None}
+    default_id = next((e["id"] for e in elements if e.get("isDefault")), None)
+    return lookup, default_id
+
+def _user_lookup(elements):
+    # login, email, 표시 이름 순으로 등록 (login이 가장 우선)
+    lookup = {}
+    for key in ("name", "email", "login"):
+        for user in elements:
+            if user.get(key):
+                lookup[_normalize(user[key])] = user["id"]
+    return lookup
+
+def _fetch_section(openproject_url, headers, section):
+    if section == "types":
+        elements = fetch_collection_elements(get_types_endpoint(openproject_url), headers)
+    elif section == "statuses":
+        elements = fetch_collection_elements(get_statuses_endpoint(openproject_url), headers)
+    elif section == "priorities":
+        elements = fetch_collection_elements(get_priorities_endpoint(openproject_url), headers)
+    else:
+        elements = fetch_collection_elements(get_user_endpoint(openproject_url), headers, concurrency=4)
+    if elements is None:
+        return None
+    if section == "users":
+        return {"lookup": _user_lookup(elements), "default": None}
+    lookup, default_id = _name_lookup(elements)
+    return {"lookup": lookup, "default": default_id}
+
+def load_metadata(openproject_url, headers, project_ids=(), use_cache=True, sections=METADATA_SECTIONS, metadata=None):
+    """
+    types / statuses / priorities / users와 프로젝트별 categories의 이름→id 조회 테이블 반환
+    한 번 조회한 결과는 METADATA_CACHE_TTL 동안 디스크 캐시에서 재사용
+    sections: 조회할 섹션 (기본값만 필요하면 DEFAULT_SECTIONS로 users 목록 조회를 생략)
+    metadata: 이미 불러온 메타데이터 (지정하면 디스크 캐시를 다시 읽지 않고, 빠진 섹션/프로젝트만 조회해 이 dict에 추가)
+    반환: {"types": {"lookup": {...}, "default": id}, ..., "categories": {"<project_id>": {...}}}
+    """
+    if metadata is None:
+        metadata = (load_cache("metadata", openproject_url, METADATA_CACHE_TTL) if use_cache else None) or {}
+    changed = False
+
+    missing_sections = [s for s in sections if s not in metadata]
+    fetched = run_in_parallel(lambda s: _fetch_section(openproject_url, headers, s), missing_sections, concurrency=4)
+    for section, data in zip(missing_sections, fetched):
+        if data is not None:
+            metadata[section] = data
+            changed = True
+
+    categories = metadata.setdefault("categories", {})
+    missing_projects = [str(p) for p in dict.fromkeys(project_ids) if p is not None and str(p) not in categories]
+    fetched = run_in_parallel(
+        lambda p: fetch_collection_elements(get_project_categories_endpoint(openproject_url, p), headers),
+        missing_projects,
+        concurrency=4,
+    )
+    for project_id, elements in zip(missing_projects, fetched):
+        if elements is not None:
+            categories[project_id] = _name_lookup(elements)[0]
+            changed = True
+
+    if changed:
+        save_cache("metadata", openproject_url, metadata)
+    return metadata
+
+def _defaults(metadata):
+    return {
+        id_col: metadata.get(NAME_COLUMNS[id_col[:-3]][1], {}).get("default") or fallback
+        for id_col, fallback in WORK_PACKAGE_DEFAULTS.items()
+    }
+
+def work_package_defaults(metadata):
+    """
+    비어 있는 type_id/status_id/priority_id에 쓸 인스턴스 기본값(isDefault)
+    메타데이터를 불러오지 못했거나 기본값이 없는 항목만 WORK_PACKAGE_DEFAULTS를 쓰고 경고 출력
+    """
+    missing = [
+        id_col for id_col in WORK_PACKAGE_DEFAULTS
+        if metadata.get(NAME_COLUMNS[id_col[:-3]][1], {}).get("default") is None
+    ]
+    if missing:
+        fallback = ", ".join(f"{col}={WORK_PACKAGE_DEFAULTS[col]}" for col in missing)
+        print(f"⚠️ 인스턴스 기본값을 불러오지 못해 고정 기본값 사용: {fallback}")
+    return _defaults(metadata)
+
+def uses_names(work_packages):
+    """
+    행 중 하나라도 이름 컬럼(type, status, ...) 값이 있으면 True
+    """
+    return any(wp.get(col) is not None for wp in work_packages for col in NAME_COLUMNS)
+
+def resolve_work_package_rows(work_packages, metadata, defaults=None):
+    """
+    이름 컬럼 값을 id로 변환해 *_id 컬럼에 채우고, 비어 있는 type/status/priority는
+    인스턴스 기본값(isDefault, 없으면 WORK_PACKAGE_DEFAULTS)으로 채움 (행 dict를 직접 수정)
+    defaults: 미리 계산한 work_package_defaults 결과 (없으면 metadata에서 계산)
+    변환할 수 없는 이름이 있으면 ValueError
+    """
+    defaults = defaults or _defaults(metadata)
+    errors = []
+    for idx, wp in enumerate(work_packages):
+        for name_col, (id_col, section) in NAME_COLUMNS.items():
+            name = wp.get(name_col)
+            if name is None:
+                continue
+            if section == "categories":
+                lookup = metadata.get("categories", {}).get(str(wp.get("project_id")), {})
+            else:
+                lookup = metadata.get(section, {}).get("lookup", {})
+            resolved = lookup.get(_normalize(name))
+            if resolved is None and str(name).strip().isdigit():
+                resolved = int(name)
+            if resolved is None:
+                errors.append(f"{idx + 1}행: {name_col} '{name}'을(를) 찾을 수 없습니다.")
+                continue
+            wp[id_col] = resolved
+        for id_col, default in defaults.items():
+            if wp.get(id_col) is None:
+                wp[id_col] = default
+    if errors:
+        raise ValueError("\n".join(errors))
+    return work_packages
@@ -0,0 +1,232 @@
+import cProfile
+import io
+import json
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from urllib.parse import urlparse
+from requester.requester import add_request_hook, remove_request_hook, add_retry_hook, remove_retry_hook
+
+METRICS_FORMATS = ("text", "json", "prometheus")
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+def endpoint_template(url):
+    """
+    URL을 집계용 endpoint 템플릿으로 변환 (예: /api/v3/work_packages/42 → /api/v3/work_packages/{id})
+    """
+    return _ID_SEGMENT.sub("/{id}", urlparse(url).path)
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+class MetricsCollector:
+    """
+    요청별 (method, endpoint, status, latency, bytes)와 로컬 단계별 소요 시간 수집
+    profile=True면 메인 스레드에서 실행되는 단계를 cProfile로, 메모리 peak를 tracemalloc으로 측정
+    """
+    def __init__(self, profile=False):
+        self.profile = profile
+        self.started = time.perf_counter()
+        self.requests = []
+        self.retries = {}
+        self.phases = {}
+        self.profiles = {}
+        self.memory_peaks = {}
+        self._lock = threading.Lock()
+        self._profiling = False
+        if profile:
+            tracemalloc.start()
+
+    def record_request(self, method, url, status, elapsed, response_bytes):
+        with self._lock:
+            self.requests.append((method, endpoint_template(url), status, elapsed, response_bytes))
+
+    def record_retry(self, url):
+        key = endpoint_template(url)
+        with self._lock:
+            self.retries[key] = self.retries.get(key, 0) + 1
+
+    @contextmanager
+    def phase(self, name):
+        profiler = None
+        if self.profile and not self._profiling and threading.current_thread() is threading.main_thread():
+            self._profiling = True
+            profiler = cProfile.Profile()
+            tracemalloc.reset_peak()
+            profiler.enable()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                total, count = self.phases.get(name, (0.0, 0))
+                self.phases[name] = (total + elapsed, count + 1)
+            if profiler is not None:
+                profiler.disable()
+                self._profiling = False
+                peak = tracemalloc.get_traced_memory()[1]
+                self.memory_peaks[name] = max(self.memory_peaks.get(name, 0), peak)
+                if name in self.profiles:
+                    self.profiles[name].add(profiler)
+                else:
+                    self.profiles[name] = pstats.Stats(profiler)
+
+    def summary(self):
+        """
+        전체/endpoint별 요청 통계와 단계별 소요 시간 dict
+        """
+        wall = time.perf_counter() - self.started
+        with self._lock:
+            requests = list(self.requests)
+            retries = dict(self.retries)
+            phases = dict(self.phases)
+        endpoints = {}
+        for method, template, status, elapsed, size in requests:
+            endpoints.setdefault((method, template), []).append((status, elapsed, size))
+        endpoint_stats = []
+        for (method, template), items in sorted(endpoints.items()):
+            latencies = sorted(elapsed for _, elapsed, _ in items)
+            statuses = {}
+            for status, _, _ in items:
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+            endpoint_stats.append({
+                "method": method,
+                "endpoint": template,
+                "count": len(items),
+                "errors": sum(1 for status, _, _ in items if status is None or status >= 400),
+                "statuses": statuses,
+                "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+                "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+                "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+                "mean_ms": round(sum(latencies) / len(latencies) * 1000, 2),
+                "bytes": sum(size for _, _, size in items),
+                "retries": retries.get(template, 0),
+            })
+        return {
+            "wall_seconds": round(wall, 3),
+            "requests": len(requests),
+            "requests_per_sec": round(len(requests) / wall, 2) if wall else 0.0,
+            "retries": sum(retries.values()),
+            "endpoints": endpoint_stats,
+            "phases": {name: {"seconds": round(total, 4), "calls": count} for name, (total, count) in phases.items()},
+            "memory_peak_bytes": dict(self.memory_peaks),
+        }
+
+def format_text(summary):
+    lines = [
+        f"📊 {summary['requests']} requests in {summary['wall_seconds']:.2f}s "
+        f"({summary['requests_per_sec']:.1f} req/s), retries {summary['retries']}"
+    ]
+    if summary["endpoints"]:
+        lines.append(f"{'endpoint':<45}{'count':>7}{'err':>6}{'p50ms':>9}{'p95ms':>9}{'p99ms':>9}{'KB':>10}{'retry':>7}")
+        for e in summary["endpoints"]:
+            name = f"{e['method']} {e['endpoint']}"
+            lines.append(f"{name:<45}{e['count']:>7}{e['errors']:>6}{e['p50_ms']:>9.1f}{e['p95_ms']:>9.1f}"
+                         f"{e['p99_ms']:>9.1f}{e['bytes'] / 1024:>10.1f}{e['retries']:>7}")
+    for name, phase in summary["phases"].items():
+        peak = summary["memory_peak_bytes"].get(name)
+        lines.append(f"⏱️ {name}: {phase['seconds']:.3f}s ({phase['calls']} calls)"
+                     + (f", peak {peak / 1024 / 1024:.1f} MB" if peak else ""))
+    return "\n".join(lines)
+
+def format_prometheus(summary):
+    lines = [
+        "# TYPE openproject_cli_requests_total counter",
+    ]
+    for e in summary["endpoints"]:
+        for status, count in e["statuses"].items():
+            lines.append(f'openproject_cli_requests_total{{method="{e["method"]}",endpoint="{e["endpoint"]}",status="{status}"}} {count}')
+    lines.append("# TYPE openproject_cli_request_duration_seconds summary")
+    for e in summary["endpoints"]:
+        for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+            lines.append(f'openproject_cli_request_duration_seconds{{method="{e["method"]}",endpoint="{e["endpoint"]}",quantile="{quantile}"}} {e[key] / 1000}')
+        lines.append(f'openproject_cli_request_duration_seconds_count{{method="{e["method"]}",endpoint="{e["endpoint"]}"}} {e["count"]}')
+    lines.append("# TYPE openproject_cli_response_bytes_total counter")
+    for e in summary["endpoints"]:
+        lines.append(f'openproject_cli_response_bytes_total{{method="{e["method"]}",endpoint="{e["endpoint"]}"}} {e["bytes"]}')
+    lines.append("# TYPE openproject_cli_retries_total counter")
+    for e in summary["endpoints"]:
+        lines.append(f'openproject_cli_retries_total{{method="{e["method"]}",endpoint="{e["endpoint"]}"}} {e["retries"]}')
+    lines.append("# TYPE openproject_cli_phase_seconds gauge")
+    for name, phase in summary["phases"].items():
+        lines.append(f'openproject_cli_phase_seconds{{phase="{name}"}} {phase["seconds"]}')
+    lines.append(f"openproject_cli_requests_per_second {summary['requests_per_sec']}")
+    return "\n".join(lines) + "\n"
+
+def format_profiles(collector, limit=15):
+    out = io.StringIO()
+    for name, stats in collector.profiles.items():
+        out.write(f"\n===== cProfile: {name} =====\n")
+        stats.stream = out
+        stats.sort_stats("cumulative").print_stats(limit)
+    return out.getvalue()
+
+_collector = None
+
+def enable_metrics(profile=False):
+    """
+    요청 hook을 등록하고 수집 시작
+    """
+    global _collector
+    disable_metrics()
+    _collector = MetricsCollector(profile=profile)
+    add_request_hook(_collector.record_request)
+    add_retry_hook(_collector.record_retry)
+    return _collector
+
+def disable_metrics():
+    global _collector
+    if _collector is not None:
+        remove_request_hook(_collector.record_request)
+        remove_retry_hook(_collector.record_retry)
+        if _collector.profile:
+            tracemalloc.stop()
+    _collector = None
+
+def get_collector():
+    return _collector
+
+def phase(name):
+    """
+    로컬 단계(excel_read, payload_build, excel_write 등) 소요 시간 측정 (수집 중이 아니면 아무것도 안 함)
+    """
+    if _collector is None:
+        return nullcontext()
+    return _collector.phase(name)
+
+def record_retry(url):
+    """
+    재시도 1회 기록 (수집 중이 아니면 무시)
+    """
+    if _collector is not None:
+        _collector.record_retry(url)
+
+def report_metrics(metrics_format="text", metrics_file=None):
+    """
+    수집 결과를 형식에 맞게 출력하거나 파일로 기록
+    """
+    if _collector is None:
+        return
+    summary = _collector.summary()
+    if metrics_format == "json":
+        output = json.dumps(summary, indent=2, ensure_ascii=False)
+    elif metrics_format == "prometheus":
+        output = format_prometheus(summary)
+    else:
+        output = format_text(summary)
+    if _collector.profile and metrics_format == "text":
+        output += format_profiles(_collector)
+    if metrics_file:
+        with open(metrics_file, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"📊 Metrics written to {metrics_file}")
+    else:
+        print(output)
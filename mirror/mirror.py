@@ -0,0 +1,133 @@
+import sqlite3
+from utils.excel_utils import WORK_PACKAGE_COLUMNS
+from workpackages.get_work_packages import WORK_PACKAGE_SELECT, build_work_package_filters, iter_work_package_pages, write_export_pages
+
+MIRROR_COLUMNS = WORK_PACKAGE_COLUMNS + ["updated_at"]
+
+_INTEGER_COLUMNS = (
+    "project_id", "author_id", "type_id", "status_id", "priority_id",
+    "assignee_id", "category_id", "lock_version", "parent_id",
+)
+
+def open_mirror(db_path):
+    """
+    로컬 work package 미러(SQLite) 열기, 없으면 테이블과 인덱스 생성
+    """
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    column_defs = ["work_package_id INTEGER PRIMARY KEY"]
+    for col in MIRROR_COLUMNS[1:]:
+        column_defs.append(f"{col} {'INTEGER' if col in _INTEGER_COLUMNS else 'TEXT'}")
+    conn.execute(f"CREATE TABLE IF NOT EXISTS work_packages ({', '.join(column_defs)})")
+    for col in ("project_id", "parent_id", "status_id", "assignee_id", "updated_at"):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS idx_work_packages_{col} ON work_packages ({col})")
+    conn.commit()
+    return conn
+
+def get_watermark(conn):
+    """
+    미러에 저장된 가장 최근 updatedAt (없으면 None)
+    """
+    return conn.execute("SELECT MAX(updated_at) FROM work_packages").fetchone()[0]
+
+def upsert_work_packages(conn, rows):
+    """
+    flatten된 work package dict 목록을 work_package_id 기준으로 upsert
+    """
+    placeholders = ", ".join("?" for _ in MIRROR_COLUMNS)
+    updates = ", ".join(f"{col} = excluded.{col}" for col in MIRROR_COLUMNS[1:])
+    sql = (
+        f"INSERT INTO work_packages ({', '.join(MIRROR_COLUMNS)}) VALUES ({placeholders}) "
+        f"ON CONFLICT(work_package_id) DO UPDATE SET {updates}"
+    )
+    conn.executemany(sql, ([row.get(col) for col in MIRROR_COLUMNS] for row in rows))
+
+def count_work_packages(conn):
+    return conn.execute("SELECT COUNT(*) FROM work_packages").fetchone()[0]
+
+def iter_mirror_pages(conn, batch_size=1000):
+    """
+    미러의 work package를 work_package_id 순서로 batch_size개씩 yield
+    """
+    cursor = conn.execute(f"SELECT {', '.join(MIRROR_COLUMNS)} FROM work_packages ORDER BY work_package_id")
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield [dict(row) for row in rows]
+
+def load_mirror_work_packages(db_path, work_package_ids, chunk_size=500):
+    """
+    미러에 저장된 work package 스냅샷 조회 (API 호출 없음)
+    반환: {work_package_id: dict} (미러에 없는 id는 빠짐)
+    """
+    ids = list(work_package_ids)
+    conn = open_mirror(db_path)
+    try:
+        work_packages = {}
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            cursor = conn.execute(
+                f"SELECT {', '.join(MIRROR_COLUMNS)} FROM work_packages WHERE work_package_id IN ({', '.join('?' for _ in chunk)})",
+                chunk,
+            )
+            for row in cursor:
+                work_packages[row["work_package_id"]] = dict(row)
+        return work_packages
+    finally:
+        conn.close()
+
+def build_updated_since_filters(watermark):
+    """
+    updatedAt >= watermark 조건의 API filters (watermark가 없으면 전체 조회용 빈 필터)
+    """
+    return build_work_package_filters(updated_since=watermark)
+
+def sync_mirror(openproject_url, headers, db_path, concurrency=4, full=False):
+    """
+    마지막 watermark 이후 변경된 work package만 조회해 미러에 upsert
+    updatedAt 기준이라 서버에서 삭제되었거나 더 이상 볼 수 없는 work package는 남아 있음
+    full: 전체를 다시 조회해 upsert하고, 이번 조회에 없는 work package를 미러에서 삭제
+    조회에 실패한 페이지가 있으면 전체를 rollback하고 이전 watermark 유지
+    (실패한 페이지의 행보다 watermark가 앞서가거나, 받지 못한 행이 삭제되지 않도록)
+    반환: (갱신된 행 수, 새 watermark), 실패 시 None
+    """
+    conn = open_mirror(db_path)
+    try:
+        watermark = get_watermark(conn)
+        filters = build_updated_since_filters(None if full else watermark)
+        if full:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS synced_ids (work_package_id INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM synced_ids")
+        synced = 0
+        failed_pages = []
+        pages = iter_work_package_pages(openproject_url, headers, concurrency=concurrency, filters=filters, select=WORK_PACKAGE_SELECT, failed_pages=failed_pages)
+        for rows in pages:
+            upsert_work_packages(conn, rows)
+            if full:
+                conn.executemany("INSERT OR IGNORE INTO synced_ids VALUES (?)", ((row["work_package_id"],) for row in rows))
+            synced += len(rows)
+        if failed_pages:
+            conn.rollback()
+            print(f"❌ 페이지 {len(failed_pages)}개 조회 실패 (page {', '.join(map(str, failed_pages))}): 변경 사항을 저장하지 않았습니다 (watermark {watermark} 유지)")
+            return None
+        pruned = 0
+        if full:
+            pruned = conn.execute("DELETE FROM work_packages WHERE work_package_id NOT IN (SELECT work_package_id FROM synced_ids)").rowcount
+        conn.commit()
+        new_watermark = get_watermark(conn)
+        removed = f", removed {pruned}" if full else ""
+        print(f"✅ Synced {synced} work packages into {db_path} (total {count_work_packages(conn)}{removed}, watermark {new_watermark})")
+        return synced, new_watermark
+    finally:
+        conn.close()
+
+def export_from_mirror(db_path, output_file, export_format="xlsx", hierarchy=False):
+    """
+    API 호출 없이 미러 내용을 export 파일로 기록
+    """
+    conn = open_mirror(db_path)
+    try:
+        return write_export_pages(iter_mirror_pages(conn), output_file, export_format, hierarchy=hierarchy)
+    finally:
+        conn.close()
@@ -1,35 +1,102 @@
-def build_work_package_payload(subject, project_id, type_id=1, status_id=1, priority_id=9, author_id=None, assignee_id=None, category_id=None, start_date=None, due_date=None, description=""):
-    from datetime import datetime
-    duration = None
+import json
+from datetime import datetime
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+@lru_cache(maxsize=None)
+def _href(collection, resource_id):
+    """
+    /api/v3/<collection>/<id> 문자열 (같은 id는 한 번만 생성)
+    """
+    return f"/api/v3/{collection}/{resource_id}"
+
+def _duration(start_date, due_date):
     if start_date and due_date:
         try:
             start_dt = datetime.strptime(start_date, "%Y-%m-%d")
             due_dt = datetime.strptime(due_date, "%Y-%m-%d")
-            days = (due_dt - start_dt).days + 1
-            duration = f"P{days}D"
+            return f"P{(due_dt - start_dt).days + 1}D"
         except Exception:
-            duration = None
-    payload = {
-        "subject": subject,
-        "scheduleManually": True,
-        "startDate": start_date,
-        "dueDate": due_date,
-        "duration": duration,
-        "_links": {
-            "category": {"href": f"/api/v3/categories/{category_id}"} if category_id else None,
-            "type": {"href": f"/api/v3/types/{type_id}"},
-            "priority": {"href": f"/api/v3/priorities/{priority_id}"},
-            "project": {"href": f"/api/v3/projects/{project_id}"},
-            "status": {"href": f"/api/v3/statuses/{status_id}"},
-            "author": {"href": f"/api/v3/users/{author_id}"} if author_id else None,
-            "assignee": {"href": f"/api/v3/users/{assignee_id}"} if assignee_id else None,
-        },
-        "description": {"raw": description}
-    }
-    payload["_links"] = {k: v for k, v in payload["_links"].items() if v is not None}
-    payload = {k: v for k, v in payload.items() if v is not None}
+            return None
+    return None
+
+def _assemble_work_package_payload(subject, project_id, type_id, status_id, priority_id, author_id, assignee_id, category_id, start_date, due_date, description, parent_id, duration):
+    links = {}
+    if category_id:
+        links["category"] = {"href": _href("categories", category_id)}
+    # type/status/priority가 None이면 링크를 빼서 서버 기본값 사용
+    if type_id:
+        links["type"] = {"href": _href("types", type_id)}
+    if priority_id:
+        links["priority"] = {"href": _href("priorities", priority_id)}
+    links["project"] = {"href": _href("projects", project_id)}
+    if status_id:
+        links["status"] = {"href": _href("statuses", status_id)}
+    if author_id:
+        links["author"] = {"href": _href("users", author_id)}
+    if assignee_id:
+        links["assignee"] = {"href": _href("users", assignee_id)}
+    if parent_id:
+        links["parent"] = {"href": _href("work_packages", parent_id)}
+    payload = {"subject": subject} if subject is not None else {}
+    payload["scheduleManually"] = True
+    if start_date is not None:
+        payload["startDate"] = start_date
+    if due_date is not None:
+        payload["dueDate"] = due_date
+    if duration is not None:
+        payload["duration"] = duration
+    payload["_links"] = links
+    payload["description"] = {"raw": description}
     return payload
 
+def build_work_package_payload(subject, project_id, type_id=None, status_id=None, priority_id=None, author_id=None, assignee_id=None, category_id=None, start_date=None, due_date=None, description="", parent_id=None):
+    return _assemble_work_package_payload(
+        subject, project_id, type_id, status_id, priority_id, author_id, assignee_id, category_id,
+        start_date, due_date, description, parent_id, _duration(start_date, due_date),
+    )
+
+def encode_json(payload):
+    """
+    payload를 요청 본문용 JSON bytes로 변환 (orjson이 있으면 사용)
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def compute_durations(work_packages):
+    """
+    모든 행의 duration(P<n>D)을 한 번에 계산 (start_date, due_date가 모두 올바른 날짜인 행만, 나머지는 None)
+    """
+    import pandas as pd
+    start = pd.to_datetime(pd.Series([wp.get("start_date") for wp in work_packages], dtype=object), format="%Y-%m-%d", errors="coerce")
+    due = pd.to_datetime(pd.Series([wp.get("due_date") for wp in work_packages], dtype=object), format="%Y-%m-%d", errors="coerce")
+    days = (due - start).dt.days + 1
+    return [f"P{int(d)}D" if d == d else None for d in days.tolist()]
+
+def build_work_package_bodies(work_packages, parent_ids=None, durations=None):
+    """
+    read_work_packages_from_excel 행 목록의 생성 payload를 한 번에 만들어 전송용 JSON bytes 리스트로 반환
+    (build_work_package_payload와 같은 payload, post_request에 그대로 전달)
+    parent_ids: 행별 부모 work package id 리스트 (없으면 각 행의 parent_id)
+    durations: compute_durations 결과 (없으면 여기서 계산)
+    """
+    if durations is None:
+        durations = compute_durations(work_packages)
+    bodies = []
+    for idx, wp in enumerate(work_packages):
+        parent_id = parent_ids[idx] if parent_ids is not None else None
+        bodies.append(encode_json(_assemble_work_package_payload(
+            wp["subject"], wp["project_id"], wp.get("type_id"), wp.get("status_id"), wp.get("priority_id"),
+            wp["author_id"], wp.get("assignee_id"), wp.get("category_id"), wp.get("start_date"), wp.get("due_date"),
+            wp.get("description", ""), parent_id or wp.get("parent_id"), durations[idx],
+        )))
+    return bodies
+
 def build_parent_patch_payload(lock_version, parent_id):
     """
     Build a payload for setting the parent of a work package.
@@ -41,4 +108,37 @@ def build_parent_patch_payload(lock_version, parent_id):
                 "href": f"/api/v3/work_packages/{parent_id}"
             }
         }
-    } 
\ No newline at end of file
+    }
+
+# 수정 payload에서 링크로 보내는 컬럼 → (링크 이름, href 경로)
+_UPDATE_LINKS = {
+    "type_id": ("type", "types"),
+    "status_id": ("status", "statuses"),
+    "priority_id": ("priority", "priorities"),
+    "assignee_id": ("assignee", "users"),
+    "category_id": ("category", "categories"),
+    "parent_id": ("parent", "work_packages"),
+}
+
+def build_work_package_update_payload(lock_version, changes):
+    """
+    바뀐 필드만 담은 work package 수정 payload 생성
+    changes: {컬럼: 새 값} (read_work_package_updates_from_excel 컬럼, None이면 값을 비움)
+    """
+    payload = {"lockVersion": lock_version}
+    links = {}
+    for col, value in changes.items():
+        if col in _UPDATE_LINKS:
+            name, path = _UPDATE_LINKS[col]
+            links[name] = {"href": f"/api/v3/{path}/{value}" if value is not None else None}
+        elif col == "start_date":
+            payload["startDate"] = value
+        elif col == "due_date":
+            payload["dueDate"] = value
+        elif col == "description":
+            payload["description"] = {"raw": value or ""}
+        else:
+            payload[col] = value
+    if links:
+        payload["_links"] = links
+    return payload
@@ -0,0 +1,432 @@
+import csv
+import functools
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from endpoints.endpoints import get_user_endpoint, get_group_endpoint, get_work_package_endpoint
+from payloads.work_package_payload import build_work_package_bodies
+from workpackages.create_work_package import create_work_package, patch_work_package_parent
+from users.create_user import create_user, fetch_existing_user_index, find_existing_user_id, find_email_conflict
+from group.group import change_group_members
+from results.results import RowResult, ProgressPrinter
+from metrics.metrics import phase, record_retry
+from requester.parallel import run_in_parallel
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# 결과 파일 컬럼 (id 컬럼 이름은 작업마다 다름: work_package_id, user_id)
+RESULT_COLUMNS = ["file", "row", "{id}", "lock_version", "status", "error"]
+
+# 단계 사이 큐의 종료 표시
+_DONE = None
+
+def _read_chunks(spec, chunk_size, parse, dtype=None):
+    """
+    입력 하나("file.xlsx" 또는 "file.xlsx#Sheet")를 chunk_size행씩 읽어 parse(DataFrame) 결과(행 dict 리스트)를 yield
+    """
+    from utils.excel_utils import split_sheet_spec, iter_table_chunks
+    path, sheet = split_sheet_spec(spec)
+    for start, df in iter_table_chunks(path, chunk_size, dtype=dtype, sheet=sheet):
+        yield start, parse(df)
+
+_worker_queue = None
+
+def _init_parse_worker(out_queue):
+    global _worker_queue
+    _worker_queue = out_queue
+
+def _parse_worker(spec, chunk_size, parse, dtype):
+    """
+    프로세스 풀에서 입력 하나를 읽어 chunk를 큐로 보냄, 마지막에 (spec, None, None, 오류 또는 None) 전송
+    """
+    try:
+        for start, rows in _read_chunks(spec, chunk_size, parse, dtype):
+            _worker_queue.put((spec, start, rows, None))
+    except Exception as e:
+        _worker_queue.put((spec, None, None, str(e) or type(e).__name__))
+        return
+    _worker_queue.put((spec, None, None, None))
+
+def iter_input_chunks(specs, parse, dtype=None, chunk_size=DEFAULT_CHUNK_SIZE, workers=1):
+    """
+    여러 입력의 chunk를 yield: (spec, 시작 행 인덱스, 행 리스트, None) 또는 읽기 실패 시 (spec, None, None, 오류)
+    parse: DataFrame chunk → 행 dict 리스트 (프로세스 풀로 보내므로 모듈 수준 함수 또는 그 functools.partial)
+    workers > 1이고 입력이 여럿이면 프로세스 풀에서 동시에 읽음 (chunk 순서는 입력 사이에서 섞일 수 있음)
+    """
+    if workers <= 1 or len(specs) <= 1:
+        for spec in specs:
+            try:
+                for start, rows in _read_chunks(spec, chunk_size, parse, dtype):
+                    yield spec, start, rows, None
+            except Exception as e:
+                yield spec, None, None, str(e) or type(e).__name__
+        return
+    # 전송 스레드가 이미 돌고 있으므로 fork 대신 spawn으로 새 프로세스 시작
+    ctx = multiprocessing.get_context("spawn")
+    out_queue = ctx.Queue(maxsize=workers * 2)
+    with ProcessPoolExecutor(max_workers=min(workers, len(specs)), mp_context=ctx,
+                             initializer=_init_parse_worker, initargs=(out_queue,)) as pool:
+        futures = {pool.submit(_parse_worker, spec, chunk_size, parse, dtype): spec for spec in specs}
+        finished = set()
+        while len(finished) < len(specs):
+            try:
+                spec, start, rows, error = out_queue.get(timeout=1)
+            except queue.Empty:
+                # 프로세스가 비정상 종료되면 종료 메시지가 오지 않으므로 future 상태로 확인
+                for future, spec in futures.items():
+                    if spec not in finished and future.done() and future.exception() is not None:
+                        finished.add(spec)
+                        yield spec, None, None, str(future.exception())
+                continue
+            if start is None:
+                finished.add(spec)
+                if error is not None:
+                    yield spec, None, None, error
+                continue
+            yield spec, start, rows, None
+
+def _row_name(spec, row):
+    return f"{spec} {row + 1}번째 행"
+
+def _row_key(spec, row):
+    return f"{spec}#{row + 1}"
+
+def validate_chunk(pending, validate, fail):
+    """
+    pending [(row, 행 dict)]를 validate 함수(validation 모듈)로 검사해 오류 행은 fail(row, 메시지)로 기록하고 나머지 반환
+    """
+    errors = {}
+    for error in validate([data for _, data in pending]):
+        errors.setdefault(error["row"], []).append(f"[{error['column']}] {error['message']}")
+    valid = []
+    for i, (row, data) in enumerate(pending):
+        if i + 1 in errors:
+            fail(row, " ".join(errors[i + 1]))
+        else:
+            valid.append((row, data))
+    return valid
+
+def run_pipeline(specs, parse, build_chunk, submit, label, dtype=None, concurrency=4, chunk_size=DEFAULT_CHUNK_SIZE, workers=1,
+                 journal=None, results_file=None, id_column="id", row_key=None, row_name=None, conflict_retries=0, refresh=None):
+    """
+    읽기 → 전송 항목 생성 → 동시 전송 → 결과 기록을 크기 제한 큐로 연결한 스트리밍 bulk 작업
+    첫 chunk를 읽는 즉시 전송을 시작하고, 메모리에는 큐에 들어 있는 chunk/항목만 유지
+    - parse / dtype: 입력 chunk를 행 dict 리스트로 바꾸는 함수와 문자열로 읽을 컬럼 (iter_input_chunks 참고)
+    - build_chunk(spec, pending, fail): pending [(row, 행 dict)]에서 전송할 [(row, 전송 항목)] 반환 (한 스레드에서 순서대로 호출)
+      보낼 수 없는 행은 fail(row, 메시지)로 요청 없이 실패 기록
+    - submit(row, 전송 항목): 요청을 보내고 RowResult 반환 (concurrency개 스레드에서 동시에 호출)
+    - journal: 행별 결과를 기록하고 이미 성공한 행은 건너뜀 (키: row_key(spec, row, 행 dict), 기본 "<입력>#<행 번호>")
+    - results_file: 행별 결과(RESULT_COLUMNS, id 컬럼 이름은 id_column)를 즉시 기록할 CSV 파일
+    - row_name(spec, row, 행 dict): 진행 상황에 표시할 이름 (기본 "<입력> <행 번호>번째 행")
+    - conflict_retries / refresh(전송 항목 리스트): 409 항목은 결과를 기록하지 않고 모아 두었다가 입력을 모두 보낸 뒤
+      refresh로 한 번에 갱신해 최대 conflict_retries번 재시도 (refresh 결과는 같은 순서의 새 전송 항목, 갱신 실패는 None)
+    반환: (성공 수, 실패 수)
+    """
+    row_key = row_key or (lambda spec, row, data: _row_key(spec, row))
+    row_name = row_name or (lambda spec, row, data: _row_name(spec, row))
+    chunk_queue = queue.Queue(maxsize=2)
+    submit_queue = queue.Queue(maxsize=concurrency * 4)
+    result_queue = queue.Queue(maxsize=concurrency * 4)
+    progress = ProgressPrinter(None, label)
+    conflicts = []
+    conflict_lock = threading.Lock()
+    # 이번 실행에서 기록한 키(중복 행 등)를 이전 실행 결과로 오인하지 않도록 시작 시점의 키만 건너뜀
+    previous_keys = set(journal.entries) if journal is not None else set()
+
+    def process_chunk(spec, start, rows):
+        names = {}
+        keys = {}
+        pending = []
+        for i, data in enumerate(rows):
+            row = start + i
+            names[row] = row_name(spec, row, data)
+            keys[row] = row_key(spec, row, data)
+            entry = journal.completed(keys[row]) if keys[row] is not None and str(keys[row]) in previous_keys else None
+            if entry is not None:
+                result_queue.put((RowResult.from_journal(row, entry), names[row], None, spec, True))
+            else:
+                pending.append((row, data))
+
+        def fail(row, message):
+            # 요청하지 않은 행은 journal에 기록하지 않음 (같은 키의 앞선 성공 기록을 덮어쓰지 않도록)
+            result_queue.put((RowResult(row, error=message), names[row], None, spec, False))
+
+        for row, item in build_chunk(spec, pending, fail):
+            submit_queue.put((spec, row, names[row], keys[row], item))
+
+    def reader():
+        try:
+            for item in iter_input_chunks(specs, parse, dtype, chunk_size, workers):
+                chunk_queue.put(item)
+        finally:
+            chunk_queue.put(_DONE)
+
+    def builder():
+        try:
+            while True:
+                item = chunk_queue.get()
+                if item is _DONE:
+                    break
+                spec, start, rows, error = item
+                if error is not None:
+                    print(f"❌ {spec} 읽기 오류: {error}")
+                    continue
+                try:
+                    process_chunk(spec, start, rows)
+                except Exception as e:
+                    print(f"❌ {spec} {start + 1}~{start + len(rows)}번째 행 처리 오류: {e}")
+                    for i in range(len(rows)):
+                        result_queue.put((RowResult(start + i, error=str(e)), _row_name(spec, start + i), None, spec, False))
+        finally:
+            for _ in range(concurrency):
+                submit_queue.put(_DONE)
+
+    def submitter():
+        try:
+            while True:
+                item = submit_queue.get()
+                if item is _DONE:
+                    break
+                spec, row, name, key, payload = item
+                try:
+                    result = submit(row, payload)
+                except Exception as e:
+                    result = RowResult(row, error=str(e))
+                if conflict_retries and result.status == 409:
+                    with conflict_lock:
+                        conflicts.append((spec, row, name, key, payload, result))
+                    continue
+                result_queue.put((result, name, key, spec, False))
+        finally:
+            result_queue.put(_DONE)
+
+    def retry_conflicts(pending, report):
+        for attempt in range(conflict_retries):
+            if not pending:
+                return
+            print(f"🔄 lockVersion 충돌 {len(pending)}건 재시도 ({attempt + 1}/{conflict_retries})")
+            retry = []
+            for (spec, row, name, key, _, result), payload in zip(pending, refresh([item[4] for item in pending])):
+                if payload is None:
+                    result.error = "lockVersion을 다시 조회하지 못해 재시도하지 않음"
+                    report(result, name, key, spec)
+                else:
+                    retry.append((spec, row, name, key, payload))
+            results = run_in_parallel(lambda item: submit(item[1], item[4]), retry, concurrency=concurrency)
+            pending = []
+            for item, result in zip(retry, results):
+                if result.status == 409 and attempt + 1 < conflict_retries:
+                    pending.append(item + (result,))
+                else:
+                    report(result, item[2], item[3], item[0])
+        for spec, row, name, key, _, result in pending:
+            report(result, name, key, spec)
+
+    threads = [threading.Thread(target=reader, daemon=True), threading.Thread(target=builder, daemon=True)]
+    threads += [threading.Thread(target=submitter, daemon=True) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    out = open(results_file, "w", newline="", encoding="utf-8") if results_file else None
+    writer = csv.writer(out) if out else None
+    if writer:
+        writer.writerow([col.format(id=id_column) for col in RESULT_COLUMNS])
+
+    def report(result, name, key, spec, resumed=False):
+        if journal is not None and key is not None and not resumed:
+            journal.record(key, result)
+        progress(result, name, resumed=resumed)
+        if writer:
+            writer.writerow([spec, result.row + 1, result.id, result.lock_version, result.status, result.error])
+
+    try:
+        finished = 0
+        while finished < concurrency:
+            item = result_queue.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            report(*item)
+        for thread in threads:
+            thread.join()
+        retry_conflicts(conflicts, report)
+    finally:
+        if out:
+            out.close()
+    progress.summary()
+    if results_file:
+        print(f"📄 행별 결과: {results_file}")
+    return progress.succeeded, progress.failed
+
+def stream_create_work_packages(openproject_url, headers, specs, concurrency=4, chunk_size=DEFAULT_CHUNK_SIZE, workers=1,
+                                journal=None, results_file=None, use_metadata_cache=True, project_id=None):
+    """
+    run_pipeline으로 work package를 스트리밍 생성
+    - specs: 입력 파일 리스트 ("file.xlsx#Sheet"로 시트 지정 가능), workers > 1이면 프로세스 풀에서 동시에 읽음
+    - 메타데이터(기본값)는 시작 전에 한 번만 불러오고, 이름 컬럼이 처음 나오면 users 등 빠진 섹션만 한 번 더 조회
+      비어 있는 type/status/priority는 chunk와 관계없이 항상 인스턴스 기본값으로 채움
+    - 행 검증과 이름 변환은 chunk 단위로 하며, 실패한 행은 요청 없이 실패로 기록하고 계속 진행
+    - 같은 시트 안의 parent_key 계층은 지원하지 않음 (이미 있는 부모는 parent_id로 지정, 계층 시트는 bulk-create-work-packages 사용)
+    - journal 키: "<입력>#<행 번호>"
+    - project_id: 지정하면 모든 행의 project_id를 이 값으로 바꿈
+    반환: (성공 수, 실패 수)
+    """
+    from validation.validation import validate_work_packages
+    from metadata.metadata import METADATA_SECTIONS, DEFAULT_SECTIONS, load_metadata, uses_names, work_package_defaults, resolve_work_package_rows
+    from utils.excel_utils import WORK_PACKAGE_DTYPES, work_packages_from_frame, apply_work_package_defaults
+
+    api_endpoint = get_work_package_endpoint(openproject_url)
+    # --refresh-metadata여도 한 번만 조회하고, 이후 chunk는 메모리의 metadata에 빠진 항목만 추가 조회
+    metadata = load_metadata(openproject_url, headers, use_cache=use_metadata_cache, sections=DEFAULT_SECTIONS)
+    defaults = work_package_defaults(metadata)
+
+    def build_chunk(spec, pending, fail):
+        rows = []
+        for row, wp in pending:
+            if wp.get("parent_key") is not None:
+                fail(row, "스트리밍 생성에서는 parent_key를 쓸 수 없습니다 (parent_id 사용)")
+            else:
+                rows.append((row, wp))
+        valid = validate_chunk(rows, validate_work_packages, fail)
+        if uses_names([wp for _, wp in valid]):
+            category_projects = [wp["project_id"] for _, wp in valid if wp.get("category") is not None]
+            load_metadata(openproject_url, headers, project_ids=category_projects, sections=METADATA_SECTIONS, metadata=metadata)
+            resolved = []
+            for row, wp in valid:
+                try:
+                    resolve_work_package_rows([wp], metadata, defaults)
+                    resolved.append((row, wp))
+                except ValueError as e:
+                    fail(row, str(e).replace("1행: ", ""))
+            valid = resolved
+        else:
+            apply_work_package_defaults([wp for _, wp in valid], defaults)
+        with phase("payload_build"):
+            bodies = build_work_package_bodies([wp for _, wp in valid])
+        return [(row, body) for (row, _), body in zip(valid, bodies)]
+
+    def submit(row, body):
+        return RowResult.from_response(row, create_work_package(api_endpoint, body, headers), (201,))
+
+    parse = functools.partial(work_packages_from_frame, apply_defaults=False, project_id=project_id)
+    return run_pipeline(specs, parse, build_chunk, submit, "Work package 생성", dtype=WORK_PACKAGE_DTYPES, concurrency=concurrency,
+                        chunk_size=chunk_size, workers=workers, journal=journal, results_file=results_file, id_column="work_package_id")
+
+def stream_create_users(openproject_url, headers, specs, group_ids=None, concurrency=4, chunk_size=DEFAULT_CHUNK_SIZE, workers=1,
+                        journal=None, results_file=None, skip_existing=True):
+    """
+    run_pipeline으로 사용자를 스트리밍 생성하고, 끝난 뒤 생성된(및 이미 있던) 사용자를 group_ids 그룹에 한 번에 추가
+    - skip_existing: 기존 사용자 목록을 시작 전에 한 번 조회해 login이 같은 행은 요청 없이 그룹 추가 대상에만 포함,
+      email이 login이 다른 기존 계정의 것이면 요청 없이 실패
+    - login/email 중복은 chunk 안에서는 validate_users로, chunk 사이에서는 먼저 나온 행을 기준으로 검사 (나중 행이 실패)
+    - journal 키: login (bulk-create-users와 같음)
+    반환: (성공 수, 실패 수)
+    """
+    from validation.validation import validate_users
+    from utils.excel_utils import USER_DTYPES, users_from_frame
+
+    api_endpoint = get_user_endpoint(openproject_url)
+    existing_index = fetch_existing_user_index(api_endpoint, headers, concurrency=max(concurrency, 4)) if skip_existing else {}
+    seen = set()
+    member_ids = []
+    member_lock = threading.Lock()
+
+    def build_chunk(spec, pending, fail):
+        to_send = []
+        for row, user in validate_chunk(pending, validate_users, fail):
+            logins = {str(user[key]).strip().lower() for key in ("login", "email")}
+            if logins & seen:
+                fail(row, "login 또는 email이 앞선 행과 중복됩니다.")
+                continue
+            seen.update(logins)
+            existing_id = find_existing_user_id(existing_index, user)
+            if existing_id is not None:
+                print(f"⏭️ 이미 존재하는 사용자: {user['login']} (id={existing_id})")
+                with member_lock:
+                    member_ids.append(existing_id)
+                continue
+            conflict = find_email_conflict(existing_index, user)
+            if conflict is not None:
+                fail(row, conflict)
+                continue
+            to_send.append((row, user))
+        return to_send
+
+    def submit(row, user):
+        result = RowResult.from_response(row, create_user(api_endpoint, user, headers), (201,))
+        if result.ok and result.id:
+            with member_lock:
+                member_ids.append(result.id)
+        return result
+
+    succeeded, failed = run_pipeline(
+        specs, users_from_frame, build_chunk, submit, "사용자 생성", dtype=USER_DTYPES, concurrency=concurrency,
+        chunk_size=chunk_size, workers=workers, journal=journal, results_file=results_file, id_column="user_id",
+        row_key=lambda spec, row, user: user.get("login"), row_name=lambda spec, row, user: user.get("login") or _row_name(spec, row),
+    )
+    if journal is not None:
+        # 이전 실행에서 생성된 사용자도 그룹 추가 대상에 포함
+        for key in list(journal.entries):
+            entry = journal.completed(key)
+            if entry is not None and entry.get("id"):
+                member_ids.append(entry["id"])
+    if group_ids and member_ids:
+        change_group_members(get_group_endpoint(openproject_url), list(group_ids), list(dict.fromkeys(member_ids)), headers)
+    return succeeded, failed
+
+def stream_patch_work_package_parents(openproject_url, headers, specs, concurrency=4, chunk_size=DEFAULT_CHUNK_SIZE, workers=1,
+                                      journal=None, results_file=None, conflict_retries=0):
+    """
+    run_pipeline으로 work package parent를 스트리밍 PATCH
+    - conflict_retries: 409(lockVersion 충돌) 항목은 입력을 모두 보낸 뒤 모아서 lockVersion을 id 필터 조회로 한 번에 갱신하고
+      이 횟수만큼 재시도 (bulk-patch-work-package-parents와 같음)
+    - work_package_id 중복은 chunk 안에서는 validate_parent_patches로, chunk 사이에서는 나중 행을 실패로 기록
+    - journal 키: work_package_id (bulk-patch-work-package-parents와 같음)
+    반환: (성공 수, 실패 수)
+    """
+    from validation.validation import validate_parent_patches
+    from utils.excel_utils import parent_patches_from_frame
+    from workpackages.get_work_packages import fetch_lock_versions
+
+    seen = set()
+
+    def build_chunk(spec, pending, fail):
+        to_send = []
+        for row, patch in validate_chunk(pending, validate_parent_patches, fail):
+            if patch["work_package_id"] in seen:
+                fail(row, "work_package_id가 앞선 행과 중복됩니다.")
+                continue
+            seen.add(patch["work_package_id"])
+            to_send.append((row, patch))
+        return to_send
+
+    def submit(row, patch):
+        response = patch_work_package_parent(openproject_url, headers, patch["work_package_id"], patch["lock_version"], patch["parent_id"])
+        return RowResult.from_response(row, response)
+
+    def refresh(patches):
+        latest = fetch_lock_versions(openproject_url, headers, {patch["work_package_id"] for patch in patches})
+        refreshed = []
+        for patch in patches:
+            wp_id = patch["work_package_id"]
+            if wp_id not in latest:
+                refreshed.append(None)
+                continue
+            record_retry(f"{openproject_url}/api/v3/work_packages/{wp_id}")
+            refreshed.append(dict(patch, lock_version=latest[wp_id]))
+        return refreshed
+
+    return run_pipeline(
+        specs, parent_patches_from_frame, build_chunk, submit, "parent patch", concurrency=concurrency,
+        chunk_size=chunk_size, workers=workers, journal=journal, results_file=results_file, id_column="work_package_id",
+        row_key=lambda spec, row, patch: patch.get("work_package_id"),
+        row_name=lambda spec, row, patch: f"work_package_id={patch.get('work_package_id')}",
+        conflict_retries=conflict_retries, refresh=refresh,
+    )
+
+def default_results_path(specs):
+    if len(specs) == 1:
+        return f"{os.path.splitext(specs[0].partition('#')[0])[0]}.results.csv"
+    return "stream.results.csv"
@@ -0,0 +1,46 @@
+import itertools
+from requester.requester import get_request
+from requester.parallel import iter_in_parallel
+
+def fetch_collection_page(url, headers, offset, page_size, params=None):
+    """
+    HAL 컬렉션의 한 페이지 조회 (offset은 1부터 시작하는 페이지 번호), 실패 시 None
+    """
+    query = dict(params or {}, offset=offset, pageSize=page_size)
+    response = get_request(url, headers=headers, params=query)
+    if response is None or response.status_code != 200:
+        print(f"❌ 조회 실패: {url} (page {offset}, {response.status_code if response is not None else 'No Response'})")
+        return None
+    return response.json()
+
+def iter_collection_pages(url, headers, page_size=100, concurrency=1, params=None):
+    """
+    컬렉션의 페이지를 순서대로 yield
+    첫 페이지의 total/pageSize로 남은 페이지 수를 계산해 최대 concurrency개씩 병렬 조회
+    실패한 페이지는 None으로 yield
+    """
+    first_page = fetch_collection_page(url, headers, 1, page_size, params)
+    if first_page is None:
+        yield None
+        return
+    total = first_page.get("total", 0)
+    # 서버가 pageSize를 제한할 수 있으므로 실제 적용된 값 사용
+    page_size = first_page.get("pageSize") or page_size
+    page_count = -(-total // page_size)
+    remaining_pages = iter_in_parallel(
+        lambda offset: fetch_collection_page(url, headers, offset, page_size, params),
+        range(2, page_count + 1),
+        concurrency=concurrency,
+    )
+    yield from itertools.chain([first_page], remaining_pages)
+
+def fetch_collection_elements(url, headers, page_size=100, concurrency=1, params=None):
+    """
+    컬렉션의 모든 element 리스트 반환 (한 페이지라도 실패하면 None)
+    """
+    elements = []
+    for page in iter_collection_pages(url, headers, page_size=page_size, concurrency=concurrency, params=params):
+        if page is None:
+            return None
+        elements.extend(page.get("_embedded", {}).get("elements", []))
+    return elements
@@ -0,0 +1,33 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+def run_in_parallel(func, items, concurrency=1):
+    """
+    items 각각에 func를 적용하고, 입력 순서대로 결과 리스트 반환
+    concurrency: 동시에 실행할 최대 작업 수 (1이면 순차 실행)
+    """
+    items = list(items)
+    if concurrency <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as executor:
+        return list(executor.map(func, items))
+
+def iter_in_parallel(func, items, concurrency=1, window=None):
+    """
+    run_in_parallel의 스트리밍 버전: 결과를 입력 순서대로 하나씩 yield
+    동시에 대기 중인 작업은 window개(기본 concurrency * 2)로 제한되어
+    items 전체 크기와 무관하게 메모리 사용량이 일정함
+    """
+    if concurrency <= 1:
+        for item in items:
+            yield func(item)
+        return
+    window = window or concurrency * 2
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -1,12 +1,153 @@
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from requester.throttle import AdaptiveThrottle, DEFAULT_MAX_RETRIES
 
-def post_request(url, payload, headers):
+# (connect, read) 초 단위 기본 타임아웃
+DEFAULT_TIMEOUT = (10, 60)
+# 호스트당 유지할 keep-alive 커넥션 수
+DEFAULT_POOL_SIZE = 20
+
+_session = None
+_timeout = DEFAULT_TIMEOUT
+_session_lock = threading.Lock()
+_throttle = AdaptiveThrottle(DEFAULT_POOL_SIZE)
+# 요청마다 호출되는 hook: hook(method, url, status, elapsed, response_bytes)
+_request_hooks = []
+# 429/503 재시도마다 호출되는 hook: hook(url)
+_retry_hooks = []
+
+def _build_session(pool_size):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def configure_session(headers=None, pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES):
+    """
+    프로세스 전체에서 공유할 keep-alive 세션 구성
+    headers: get_auth_headers 결과 (모든 요청에 기본 적용)
+    pool_size: 커넥션 풀 크기 (동시 요청 수 한도의 상한)
+    timeout: 기본 타임아웃 (초 또는 (connect, read) 튜플)
+    max_retries: 429/503 응답의 최대 재시도 횟수
+    """
+    global _session, _timeout, _throttle
+    session = _build_session(pool_size)
+    if headers:
+        session.headers.update(headers)
+    with _session_lock:
+        old_session = _session
+        _session = session
+        _timeout = timeout
+        _throttle = AdaptiveThrottle(pool_size, max_retries=max_retries)
+    if old_session is not None:
+        old_session.close()
+    return session
+
+def get_session():
+    """
+    공유 세션 반환 (없으면 기본 설정으로 생성)
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session(DEFAULT_POOL_SIZE)
+    return _session
+
+def add_request_hook(hook):
+    """
+    모든 요청 완료 시 호출할 hook 등록
+    hook(method, url, status, elapsed, response_bytes): 네트워크 오류면 status None, response_bytes 0
+    """
+    _request_hooks.append(hook)
+
+def remove_request_hook(hook):
+    if hook in _request_hooks:
+        _request_hooks.remove(hook)
+
+def add_retry_hook(hook):
+    """
+    429/503 응답 후 재시도할 때마다 호출할 hook(url) 등록
+    """
+    _retry_hooks.append(hook)
+
+def remove_retry_hook(hook):
+    if hook in _retry_hooks:
+        _retry_hooks.remove(hook)
+
+def send_request(method, url, headers=None, **kwargs):
+    """
+    공유 세션으로 요청 전송 (예외는 호출자에게 전달)
+    모든 요청은 공유 throttle을 거치며, 429/503은 Retry-After(없으면 jitter backoff)만큼 기다린 뒤 재시도
+    """
+    kwargs.setdefault("timeout", _timeout)
+    throttle = _throttle
+    attempt = 0
+    while True:
+        throttle.acquire()
+        started = time.perf_counter()
+        try:
+            response = get_session().request(method, url, headers=headers, **kwargs)
+        except requests.exceptions.RequestException:
+            throttle.release()
+            if _request_hooks:
+                _run_hooks(method, url, None, time.perf_counter() - started, 0)
+            raise
+        elapsed = time.perf_counter() - started
+        if _request_hooks:
+            _run_hooks(method, url, response.status_code, elapsed, len(response.content))
+        delay = throttle.release(response.status_code, elapsed, response.headers.get("Retry-After"), attempt)
+        if delay is None:
+            return response
+        attempt += 1
+        for hook in list(_retry_hooks):
+            hook(url)
+        time.sleep(delay)
+
+def _run_hooks(method, url, status, elapsed, response_bytes):
+    for hook in list(_request_hooks):
+        hook(method, url, status, elapsed, response_bytes)
+
+def get_request(url, headers=None, params=None):
+    """
+    GET 요청 래퍼
+    """
+    try:
+        response = send_request("GET", url, headers=headers, params=params)
+        return response
+    except requests.exceptions.RequestException as e:
+        print(f"네트워크 오류: {e}")
+        return None
+
+def _body_kwargs(payload, headers):
+    """
+    미리 직렬화된 JSON bytes는 다시 인코딩하지 않고 그대로 전송
+    """
+    if isinstance(payload, (bytes, bytearray)):
+        return {"data": payload, "headers": {"Content-Type": "application/json", **(headers or {})}}
+    return {"json": payload, "headers": headers}
+
+def post_request(url, payload, headers=None):
+    """
+    POST 요청 래퍼 (payload: dict 또는 미리 직렬화된 JSON bytes)
+    """
+    try:
+        response = send_request("POST", url, **_body_kwargs(payload, headers))
+        return response
+    except requests.exceptions.RequestException as e:
+        print(f"네트워크 오류: {e}")
+        return None
+
+def patch_request(url, payload, headers=None):
     """
-    POST 요청 래퍼
+    PATCH 요청 래퍼 (payload: dict 또는 미리 직렬화된 JSON bytes)
     """
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        response = send_request("PATCH", url, **_body_kwargs(payload, headers))
         return response
     except requests.exceptions.RequestException as e:
         print(f"네트워크 오류: {e}")
-        return None 
\ No newline at end of file
+        return None
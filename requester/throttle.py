@@ -0,0 +1,106 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# 재시도할 상태 코드 (요청이 처리되지 않았음을 뜻하는 rate limit / 과부하 응답)
+RETRY_STATUSES = (429, 503)
+# 요청당 최대 재시도 횟수
+DEFAULT_MAX_RETRIES = 5
+# Retry-After가 없을 때 지수 backoff 기본값과 상한 (초)
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+# Retry-After를 따를 때의 최대 대기 시간 (초)
+RETRY_AFTER_CAP = 120.0
+# 지연 시간이 기준값의 이 배수 이하일 때만 동시 요청 수를 늘림
+LATENCY_TOLERANCE = 2.0
+# 지연 시간 이동 평균 가중치
+LATENCY_EWMA_WEIGHT = 0.2
+
+def parse_retry_after(value):
+    """
+    Retry-After 헤더(초 또는 HTTP 날짜)를 대기 초로 변환 (해석할 수 없으면 None)
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveThrottle:
+    """
+    프로세스 전체 요청에 적용되는 AIMD 동시성 제어 + 재시도 대기 계산
+    - 429/503: 동시 요청 한도를 절반으로 줄이고(multiplicative decrease), Retry-After 동안 모든 요청을 멈춤
+    - 정상 응답: 지연 시간이 기준값 대비 괜찮으면 한도를 요청 1건당 1/한도씩 늘림(additive increase)
+    max_concurrency: 한도의 상한 (커넥션 풀 크기), 처음에는 상한에서 시작
+    """
+    def __init__(self, max_concurrency, max_retries=DEFAULT_MAX_RETRIES):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._last_decrease = 0.0
+        self._latency = None
+        self._baseline = None
+        self._cond = threading.Condition()
+        self._random = random.Random()
+
+    def acquire(self):
+        """
+        요청 슬롯 하나를 얻을 때까지 대기 (한도 초과 또는 Retry-After 중이면 대기)
+        """
+        with self._cond:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                self._cond.wait(timeout=wait if wait > 0 else None)
+
+    def release(self, status=None, elapsed=None, retry_after=None, attempt=0):
+        """
+        슬롯 반환 후 응답 결과로 한도 조정
+        반환: 재시도 전 대기할 초 (재시도하지 않으면 None)
+        """
+        with self._cond:
+            self.in_flight -= 1
+            delay = None
+            if status in RETRY_STATUSES:
+                now = time.monotonic()
+                # 한 번 줄인 뒤 도착한, 줄이기 전에 보낸 요청의 429/503으로는 다시 줄이지 않음
+                if elapsed is None or now - elapsed >= self._last_decrease:
+                    self.limit = max(1.0, self.limit / 2)
+                    self._last_decrease = now
+                wait = parse_retry_after(retry_after)
+                if wait is not None:
+                    # 같은 서버로 가는 다른 요청도 Retry-After 동안 멈춤
+                    self.paused_until = max(self.paused_until, now + min(RETRY_AFTER_CAP, wait))
+                if attempt < self.max_retries:
+                    delay = self._retry_delay(wait, attempt)
+            elif status is not None and elapsed is not None:
+                self._observe_latency(elapsed)
+                if self._baseline is None or self._latency <= self._baseline * LATENCY_TOLERANCE:
+                    self.limit = min(float(self.max_concurrency), self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+            return delay
+
+    def _retry_delay(self, retry_after, attempt):
+        if retry_after is not None:
+            # 대기 후 동시에 몰리지 않도록 약간의 jitter 추가
+            return min(RETRY_AFTER_CAP, retry_after) + self._random.uniform(0, BACKOFF_BASE)
+        # full jitter 지수 backoff
+        return self._random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    def _observe_latency(self, elapsed):
+        if self._latency is None:
+            self._latency = elapsed
+        else:
+            self._latency += LATENCY_EWMA_WEIGHT * (elapsed - self._latency)
+        if self._baseline is None or self._latency < self._baseline:
+            self._baseline = self._latency
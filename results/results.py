@@ -0,0 +1,87 @@
+import threading
+
+# 실패 결과에 남길 오류 메시지 최대 길이
+ERROR_TEXT_LIMIT = 300
+
+def _error_text(response):
+    """
+    오류 response의 메시지 (HAL Error면 message, 아니면 본문 앞부분)
+    """
+    try:
+        message = response.json().get("message")
+    except (ValueError, AttributeError):
+        message = None
+    return (message or response.text or "")[:ERROR_TEXT_LIMIT]
+
+class RowResult:
+    """
+    bulk 작업 한 행의 결과 (response 본문 대신 행 번호, id, lockVersion, 상태 코드, 짧은 오류만 보관)
+    row: 입력 리스트의 0부터 시작하는 인덱스
+    error가 있으면 2xx 응답이라도 실패 (예: 201을 기대한 생성 요청의 200)
+    """
+    __slots__ = ("row", "status", "id", "lock_version", "error")
+
+    def __init__(self, row, status=None, id=None, lock_version=None, error=None):
+        self.row = row
+        self.status = status
+        self.id = id
+        self.lock_version = lock_version
+        self.error = error
+
+    @classmethod
+    def from_response(cls, row, response, success_codes=(200, 201)):
+        if response is None:
+            return cls(row, error="No Response")
+        if response.status_code in success_codes:
+            data = response.json()
+            return cls(row, response.status_code, data.get("id"), data.get("lockVersion"))
+        if 200 <= response.status_code < 300:
+            return cls(row, response.status_code, error=f"예상하지 않은 응답 코드 (기대: {', '.join(map(str, success_codes))})")
+        return cls(row, response.status_code, error=_error_text(response) or "오류 응답")
+
+    @classmethod
+    def from_journal(cls, row, entry):
+        """
+        재개(resume) 시 journal에 기록된 이전 결과
+        """
+        return cls(row, entry.get("status"), entry.get("id"), entry.get("lock_version"))
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+    def __repr__(self):
+        return f"RowResult(row={self.row}, status={self.status}, id={self.id}, lock_version={self.lock_version}, error={self.error!r})"
+
+class ProgressPrinter:
+    """
+    행 결과가 나올 때마다 진행 상황을 한 줄씩 출력 (여러 스레드에서 호출 가능)
+    total: 전체 행 수 (스트리밍처럼 미리 알 수 없으면 None)
+    """
+    def __init__(self, total, label):
+        self.total = total
+        self.label = label
+        self.done = 0
+        self.succeeded = 0
+        self.failed = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, result, name, resumed=False):
+        with self._lock:
+            self.done += 1
+            if result.ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            counter = f"{self.done}/{self.total}" if self.total is not None else str(self.done)
+            prefix = f"[{counter}] {name}: {self.label}"
+            if resumed:
+                line = f"⏭️ {prefix} 이전 실행에서 완료"
+            elif result.ok:
+                line = f"✅ {prefix} 성공" + (f" (id={result.id})" if result.id is not None else "")
+            else:
+                line = f"❌ {prefix} 실패 - " + " ".join(str(v) for v in (result.status, result.error) if v)
+            print(line)
+
+    def summary(self):
+        print(f"📊 {self.label}: 성공 {self.succeeded}건, 실패 {self.failed}건 (전체 {self.done}건)")
@@ -1,6 +1,9 @@
 from requester.requester import post_request
-from utils.excel_utils import read_users_from_excel
-from group.group import get_group_list, print_group_list_with_index, update_group_members
+from requester.parallel import run_in_parallel
+from requester.collection import fetch_collection_elements
+from metrics.metrics import phase
+from results.results import RowResult, ProgressPrinter
+from group.group import get_group_list, print_group_list_with_index, change_group_members
 
 def create_user(api_endpoint, user_payload, headers):
     """
@@ -9,18 +12,69 @@ def create_user(api_endpoint, user_payload, headers):
     response = post_request(api_endpoint, user_payload, headers)
     return response
 
-def bulk_create_users(api_endpoint, headers, excel_file, group_api_endpoint=None):
+def fetch_existing_user_index(api_endpoint, headers, concurrency=4):
+    """
+    /api/v3/users 전체 페이지를 병렬 조회해 {"logins": {소문자 login: user id}, "emails": {소문자 email: 소문자 login}} 반환
+    """
+    elements = fetch_collection_elements(api_endpoint, headers, page_size=1000, concurrency=concurrency)
+    if elements is None:
+        print("⚠️ 기존 사용자 목록을 불러오지 못했습니다. 모든 행을 생성 시도합니다.")
+        return {}
+    index = {"logins": {}, "emails": {}}
+    for user in elements:
+        login = str(user.get("login") or "").strip().lower()
+        if login:
+            index["logins"][login] = user["id"]
+        if user.get("email"):
+            index["emails"][str(user["email"]).strip().lower()] = login
+    return index
+
+def find_existing_user_id(existing_index, user):
+    """
+    login이 같은 사용자가 이미 있으면 해당 user id, 없으면 None
+    (email만 같은 다른 계정은 기존 사용자로 보지 않음, find_email_conflict 참고)
+    """
+    return existing_index.get("logins", {}).get(str(user["login"]).strip().lower())
+
+def find_email_conflict(existing_index, user):
+    """
+    email을 login이 다른 기존 계정이 쓰고 있으면 오류 메시지, 아니면 None
+    (그 계정을 그룹에 추가하면 다른 사람에게 권한을 주게 되므로 행을 실패로 처리)
+    """
+    login = str(user["login"]).strip().lower()
+    owner = existing_index.get("emails", {}).get(str(user["email"]).strip().lower())
+    if owner is not None and owner != login:
+        return f"email {user['email']}은(는) 다른 계정(login={owner})이 사용 중입니다."
+    return None
+
+def bulk_create_users(api_endpoint, headers, excel_file, group_api_endpoint=None, group_ids=None, journal=None, validate_only=False, report_file=None, concurrency=1, skip_existing=True):
     """
     엑셀에서 사용자 생성 후, 그룹 선택 및 그룹에 사용자 추가
+    group_ids: 사용자를 추가할 그룹 id 리스트 (없으면 그룹 목록에서 선택)
+    concurrency: 동시에 보낼 최대 생성 요청 수
+    skip_existing: 기존 사용자(login 일치)를 미리 조회해 생성 요청 없이 그룹 추가 대상에만 포함,
+                   email이 login이 다른 기존 계정의 것이면 그 행은 요청 없이 실패
+    journal: login별 결과를 즉시 기록할 Journal (이미 생성된 사용자는 요청 없이 건너뜀)
+    validate_only: 사전 검증만 수행하고 요청은 보내지 않음
+    report_file: 사전 검증 오류를 기록할 CSV 파일 (선택)
     """
+    # pandas 기반 모듈은 bulk 작업에서만 import (단건 명령의 시작 시간 단축)
+    from utils.excel_utils import read_users_from_excel
+    from validation.validation import validate_users, report_validation_errors
     try:
-        users = read_users_from_excel(excel_file)
+        with phase("excel_read"):
+            users = read_users_from_excel(excel_file)
     except Exception as e:
         print(f"❌ 엑셀 읽기 오류: {e}")
         return
+    # 네트워크 요청 전에 시트 전체 검증
+    with phase("validation"):
+        errors = validate_users(users)
+    if not report_validation_errors(errors, report_file) or validate_only:
+        return
 
-    group_id = None
-    if group_api_endpoint:
+    group_ids = list(group_ids or [])
+    if group_api_endpoint and not group_ids:
         # 그룹 목록 조회 및 선택
         groups = get_group_list(group_api_endpoint, headers)
         if not groups:
@@ -32,27 +86,54 @@ def bulk_create_users(api_endpoint, headers, excel_file, group_api_endpoint=None
             try:
                 sel = int(input("사용자를 추가할 그룹 번호를 선택하세요 (건너뛰려면 0): "))
                 if sel > 0 and sel <= len(group_elements):
-                    group_id = group_elements[sel-1]["id"]
+                    group_ids.append(group_elements[sel-1]["id"])
                 else:
                     print("그룹 추가 없이 사용자만 생성합니다.")
             except Exception:
                 print("입력 오류. 그룹 추가 없이 사용자만 생성합니다.")
 
+    # 이미 있는 사용자(login 일치)는 요청 없이 id만 확인 (그룹 추가에는 포함)
     created_user_ids = []
+    new_users = []
+    email_conflicts = []
+    existing_index = fetch_existing_user_index(api_endpoint, headers, concurrency=max(concurrency, 4)) if skip_existing else {}
     for user in users:
-        response = create_user(api_endpoint, user, headers)
-        if response is not None and response.status_code == 201:
-            print(f"✅ 사용자 생성 성공: {user['login']}")
-            user_id = response.json().get("id")
-            if user_id:
-                created_user_ids.append(user_id)
-        else:
-            print(f"❌ 사용자 생성 실패: {user['login']} - {response.status_code if response is not None else 'No Response'}")
+        existing_id = find_existing_user_id(existing_index, user)
+        if existing_id is not None:
+            print(f"⏭️ 이미 존재하는 사용자: {user['login']} (id={existing_id})")
+            created_user_ids.append(existing_id)
+            continue
+        conflict = find_email_conflict(existing_index, user)
+        if conflict is not None:
+            email_conflicts.append((user, conflict))
+            continue
+        if journal is not None:
+            entry = journal.completed(user["login"])
+            if entry is not None:
+                print(f"⏭️ 이전 실행에서 생성됨: {user['login']}")
+                if entry.get("id"):
+                    created_user_ids.append(entry["id"])
+                continue
+        new_users.append(user)
+
+    progress = ProgressPrinter(len(new_users) + len(email_conflicts), "사용자 생성")
+    for user, conflict in email_conflicts:
+        progress(RowResult(None, error=conflict), user["login"])
+
+    def create_row(idx):
+        user = new_users[idx]
+        result = RowResult.from_response(idx, create_user(api_endpoint, user, headers), (201,))
+        if journal is not None:
+            journal.record(user["login"], result)
+        progress(result, user["login"])
+        return result
+
+    for result in run_in_parallel(create_row, range(len(new_users)), concurrency=concurrency):
+        if result.ok and result.id:
+            created_user_ids.append(result.id)
+    if new_users or email_conflicts:
+        progress.summary()
 
     # 그룹에 사용자 추가
-    if group_id and created_user_ids:
-        group_update_resp = update_group_members(group_api_endpoint, group_id, created_user_ids, headers)
-        if group_update_resp is not None and group_update_resp.status_code in (200, 204):
-            print(f"✅ 그룹(id={group_id})에 사용자 추가 성공!")
-        else:
-            print(f"❌ 그룹에 사용자 추가 실패: {group_update_resp.status_code if group_update_resp is not None else 'No Response'}") 
\ No newline at end of file
+    if group_api_endpoint and group_ids and created_user_ids:
+        change_group_members(group_api_endpoint, group_ids, created_user_ids, headers)
\ No newline at end of file
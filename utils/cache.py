@@ -0,0 +1,42 @@
+import hashlib
+import json
+import os
+import time
+
+def get_cache_dir():
+    """
+    디스크 캐시 디렉터리 (OPENPROJECT_CACHE_DIR, 기본 .openproject_cache)
+    """
+    return os.getenv("OPENPROJECT_CACHE_DIR", ".openproject_cache")
+
+def _cache_path(name, key):
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(get_cache_dir(), f"{name}-{digest}.json")
+
+def load_cache(name, key, ttl):
+    """
+    ttl(초) 이내에 저장된 캐시 데이터 반환 (없거나 만료되면 None)
+    """
+    path = _cache_path(name, key)
+    try:
+        with open(path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if time.time() - entry.get("saved_at", 0) > ttl:
+        return None
+    return entry.get("data")
+
+def save_cache(name, key, data):
+    """
+    캐시 데이터 저장 (실패해도 무시)
+    """
+    path = _cache_path(name, key)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "data": data}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"⚠️ 캐시 저장 실패: {e}")
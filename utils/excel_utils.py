@@ -1,99 +1,298 @@
+import itertools
+import os
 import pandas as pd
-from datetime import datetime
 
-def read_users_from_excel(excel_file):
+# work package export 컬럼 (순서 유지)
+WORK_PACKAGE_COLUMNS = [
+    "work_package_id", "subject", "project_id", "author_id", "type_id", "status_id", "priority_id", "assignee_id", "category_id", "start_date", "due_date", "duration", "description", "lock_version", "parent_id"
+]
+
+# 비어 있는 work package id 컬럼의 기본값
+WORK_PACKAGE_DEFAULTS = {"type_id": 1, "status_id": 1, "priority_id": 9}
+
+# bulk-update-work-packages에서 비교/수정하는 컬럼
+WORK_PACKAGE_UPDATE_COLUMNS = [
+    "subject", "type_id", "status_id", "priority_id", "assignee_id", "category_id", "start_date", "due_date", "description", "parent_id"
+]
+
+# 이름으로 지정할 수 있는 컬럼 (metadata.resolve_work_package_rows에서 id로 변환)
+WORK_PACKAGE_NAME_COLUMNS = ["type", "status", "priority", "category", "author", "assignee"]
+
+# work package 시트에서 문자열로 읽을 컬럼
+WORK_PACKAGE_DTYPES = {"subject": str, "description": str, "row_key": str, "parent_key": str}
+WORK_PACKAGE_DTYPES.update({col: str for col in WORK_PACKAGE_NAME_COLUMNS})
+# 사용자 시트의 필수 컬럼 (모두 문자열로 읽음)
+USER_DTYPES = {col: str for col in ("login", "email", "firstName", "lastName", "password")}
+
+def read_table(path, dtype=None):
     """
-    엑셀 파일에서 사용자 정보를 읽어 리스트로 반환
-    컬럼: login, email, firstName, lastName, password, (선택)admin, (선택)status
+    확장자에 따라 xlsx / csv / parquet 파일을 DataFrame으로 읽기
+    dtype: 컬럼별 dtype dict (parquet은 파일에 저장된 타입을 그대로 사용)
+    """
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext == ".csv":
+        return pd.read_csv(path, dtype=dtype)
+    if ext == ".parquet":
+        return pd.read_parquet(path)
+    return pd.read_excel(path, dtype=dtype)
+
+def split_sheet_spec(spec):
     """
-    df = pd.read_excel(excel_file)
-    required_columns = ['login', 'email', 'firstName', 'lastName', 'password']
+    "file.xlsx#Sheet2" 형식 입력을 (파일 경로, 시트 이름)으로 분리 (시트가 없으면 None)
+    """
+    path, sep, sheet = str(spec).partition("#")
+    if sep and not os.path.exists(spec):
+        return path, sheet or None
+    return str(spec), None
+
+def iter_table_chunks(path, chunk_size=1000, dtype=None, sheet=None):
+    """
+    xlsx / csv / parquet 파일을 chunk_size행씩 DataFrame으로 읽어 yield (파일 전체를 메모리에 올리지 않음)
+    yield: (첫 행의 0부터 시작하는 인덱스, DataFrame)
+    dtype: 지정한 컬럼을 문자열로 읽을 컬럼 dict (값이 str인 항목만 적용)
+    sheet: xlsx 시트 이름 (없으면 첫 시트)
+    """
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext == ".csv":
+        start = 0
+        for df in pd.read_csv(path, dtype=dtype, chunksize=chunk_size):
+            yield start, df.reset_index(drop=True)
+            start += len(df)
+        return
+    if ext == ".parquet":
+        import pyarrow.parquet as pq
+        start = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            df = batch.to_pandas()
+            yield start, df
+            start += len(df)
+        return
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet_obj = workbook[sheet] if sheet else workbook.worksheets[0]
+        rows = sheet_obj.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(col) for col in header]
+        start = 0
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            # 완전히 빈 행은 건너뜀 (read_excel과 같게)
+            chunk = [row for row in chunk if any(value is not None for value in row)]
+            if not chunk:
+                continue
+            df = pd.DataFrame(chunk, columns=columns)
+            for col, col_type in (dtype or {}).items():
+                if col_type is str and col in df.columns:
+                    df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+            yield start, df
+            start += len(chunk)
+    finally:
+        workbook.close()
+
+def write_table(df, path):
+    """
+    확장자에 따라 DataFrame을 xlsx / csv / parquet 파일로 기록
+    """
+    ext = os.path.splitext(str(path))[1].lower()
+    if ext == ".csv":
+        df.to_csv(path, index=False)
+    elif ext == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+
+def _check_required_columns(df, required_columns):
     missing_columns = [col for col in required_columns if col not in df.columns]
     if missing_columns:
         raise ValueError(f"필수 컬럼 누락: {missing_columns}")
-    users = []
-    for _, row in df.iterrows():
-        user = {
-            "login": row['login'],
-            "email": row['email'],
-            "firstName": row['firstName'],
-            "lastName": row['lastName'],
-            "password": row['password'],
-            "admin": row.get('admin', False),
-            "status": row.get('status', 'active')
-        }
-        users.append(user)
-    return users
-
-def read_work_packages_from_excel(excel_file):
-    """
-    엑셀 파일에서 work package 정보를 읽어 리스트로 반환
+
+def _to_list(series):
+    """
+    Series를 결측값이 None인 파이썬 값 리스트로 변환
+    """
+    return series.astype(object).where(series.notna(), None).tolist()
+
+def _column(df, col, default=None):
+    """
+    컬럼 값 리스트 (컬럼이 없거나 값이 비어 있으면 default)
+    """
+    if col not in df.columns:
+        return [default] * len(df)
+    series = df[col]
+    if default is not None:
+        series = series.astype(object).fillna(default)
+    return _to_list(series)
+
+def _int_column(df, col, default=None):
+    """
+    nullable 정수 컬럼 값 리스트 (컬럼이 없거나 값이 비어 있으면 default)
+    """
+    if col not in df.columns:
+        return [default] * len(df)
+    series = pd.to_numeric(df[col]).astype("Int64")
+    if default is not None:
+        series = series.fillna(default)
+    return _to_list(series)
+
+def _key_column(df, col):
+    """
+    행 참조 키 컬럼을 문자열 리스트로 정규화 (정수형 키 1, 1.0, "1"은 모두 "1")
+    """
+    if col not in df.columns:
+        return [None] * len(df)
+    series = df[col]
+    if pd.api.types.is_numeric_dtype(series):
+        series = series.astype("Int64")
+    return _to_list(series.astype(str).where(series.notna()))
+
+def _date_column(df, col):
+    """
+    날짜 컬럼을 YYYY-MM-DD 문자열 리스트로 정규화 (비어 있으면 None)
+    """
+    if col not in df.columns:
+        return [None] * len(df)
+    series = df[col]
+    if pd.api.types.is_datetime64_any_dtype(series):
+        formatted = series.dt.strftime("%Y-%m-%d")
+    else:
+        # datetime 객체는 str() 결과 앞 10자리가 YYYY-MM-DD
+        formatted = series.astype(str).str[:10]
+    return _to_list(formatted.where(series.notna()))
+
+def _rows(columns):
+    """
+    {컬럼명: 값 리스트} dict를 행 단위 dict 리스트로 변환
+    """
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+def read_users_from_excel(excel_file):
+    """
+    엑셀(xlsx/csv/parquet) 파일에서 사용자 정보를 읽어 리스트로 반환
+    컬럼: login, email, firstName, lastName, password, (선택)admin, (선택)status
+    """
+    df = read_table(excel_file, dtype=USER_DTYPES)
+    return users_from_frame(df)
+
+def users_from_frame(df):
+    """
+    read_users_from_excel과 같은 규칙으로 DataFrame(또는 iter_table_chunks의 chunk)을 행 dict 리스트로 변환
+    """
+    required_columns = list(USER_DTYPES)
+    _check_required_columns(df, required_columns)
+    columns = {col: _column(df, col) for col in required_columns}
+    columns["admin"] = _to_list(df["admin"].astype(object).fillna(False).astype(bool)) if "admin" in df.columns else [False] * len(df)
+    columns["status"] = _column(df, "status", "active")
+    return _rows(columns)
+
+def read_work_packages_from_excel(excel_file, apply_defaults=True, project_id=None):
+    """
+    엑셀(xlsx/csv/parquet) 파일에서 work package 정보를 읽어 리스트로 반환
     컬럼: subject, project_id, type_id, status_id, priority_id, author_id, assignee_id, category_id, start_date, due_date, description
+    계층 컬럼(선택): row_key (행 식별 키), parent_key (같은 시트 내 부모 행의 row_key), parent_id (이미 존재하는 부모 work package id)
+    이름 컬럼(선택): type, status, priority, category, author, assignee (이름/login, metadata.resolve_work_package_rows로 id 변환)
+    apply_defaults: False면 비어 있는 type_id/status_id/priority_id를 None으로 둠
+    project_id: 지정하면 모든 행의 project_id를 이 값으로 바꿈 (시트에 project_id 컬럼이 없어도 됨)
     """
-    df = pd.read_excel(excel_file)
-    required_columns = ['subject', 'project_id', 'author_id']
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        raise ValueError(f"필수 컬럼 누락: {missing_columns}")
-    work_packages = []
-    for _, row in df.iterrows():
-        def format_date(val):
-            if pd.isna(val):
-                return None
-            if isinstance(val, datetime):
-                return val.strftime('%Y-%m-%d')
-            if isinstance(val, str) and len(val) >= 10:
-                return val[:10]
-            return str(val)
-        wp = {
-            "subject": row['subject'],
-            "project_id": int(row['project_id']),
-            "type_id": int(row['type_id']) if 'type_id' in df.columns and not pd.isna(row.get('type_id')) else 1,
-            "status_id": int(row['status_id']) if 'status_id' in df.columns and not pd.isna(row.get('status_id')) else 1,
-            "priority_id": int(row['priority_id']) if 'priority_id' in df.columns and not pd.isna(row.get('priority_id')) else 9,
-            "author_id": int(row['author_id']),
-            "assignee_id": int(row['assignee_id']) if 'assignee_id' in df.columns and not pd.isna(row.get('assignee_id')) else None,
-            "category_id": int(row['category_id']) if 'category_id' in df.columns and not pd.isna(row.get('category_id')) else None,
-            "start_date": format_date(row['start_date']) if 'start_date' in df.columns else None,
-            "due_date": format_date(row['due_date']) if 'due_date' in df.columns else None,
-            "description": str(row['description']) if 'description' in df.columns and not pd.isna(row.get('description')) else ""
-        }
-        work_packages.append(wp)
+    df = read_table(excel_file, dtype=WORK_PACKAGE_DTYPES)
+    return work_packages_from_frame(df, apply_defaults=apply_defaults, project_id=project_id)
+
+def work_packages_from_frame(df, apply_defaults=True, project_id=None):
+    """
+    read_work_packages_from_excel과 같은 규칙으로 DataFrame(또는 iter_table_chunks의 chunk)을 행 dict 리스트로 변환
+    """
+    _check_required_columns(df, ['subject'] if project_id is not None else ['subject', 'project_id'])
+    if 'author_id' not in df.columns and 'author' not in df.columns:
+        raise ValueError("필수 컬럼 누락: ['author_id']")
+    defaults = WORK_PACKAGE_DEFAULTS if apply_defaults else {}
+    columns = {
+        "subject": _column(df, "subject"),
+        "project_id": [project_id] * len(df) if project_id is not None else _int_column(df, "project_id"),
+        "type_id": _int_column(df, "type_id", defaults.get("type_id")),
+        "status_id": _int_column(df, "status_id", defaults.get("status_id")),
+        "priority_id": _int_column(df, "priority_id", defaults.get("priority_id")),
+        "author_id": _int_column(df, "author_id"),
+        "assignee_id": _int_column(df, "assignee_id"),
+        "category_id": _int_column(df, "category_id"),
+        "start_date": _date_column(df, "start_date"),
+        "due_date": _date_column(df, "due_date"),
+        "description": _column(df, "description", ""),
+        "row_key": _key_column(df, "row_key"),
+        "parent_key": _key_column(df, "parent_key"),
+        "parent_id": _int_column(df, "parent_id"),
+    }
+    for col in WORK_PACKAGE_NAME_COLUMNS:
+        columns[col] = _column(df, col)
+    return _rows(columns)
+
+def apply_work_package_defaults(work_packages, defaults=WORK_PACKAGE_DEFAULTS):
+    """
+    비어 있는 type_id/status_id/priority_id를 기본값으로 채움 (행 dict를 직접 수정)
+    """
+    for wp in work_packages:
+        for col, default in defaults.items():
+            if wp.get(col) is None:
+                wp[col] = default
     return work_packages
 
 def read_parent_patch_from_excel(excel_file):
     """
-    엑셀 파일에서 parent patch 정보를 읽어 리스트로 반환
+    엑셀(xlsx/csv/parquet) 파일에서 parent patch 정보를 읽어 리스트로 반환
     컬럼: work_package_id, lock_version, parent_id
     """
-    df = pd.read_excel(excel_file)
+    return parent_patches_from_frame(read_table(excel_file))
+
+def parent_patches_from_frame(df):
+    """
+    read_parent_patch_from_excel과 같은 규칙으로 DataFrame(또는 iter_table_chunks의 chunk)을 행 dict 리스트로 변환
+    """
     required_columns = ['work_package_id', 'lock_version', 'parent_id']
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    if missing_columns:
-        raise ValueError(f"필수 컬럼 누락: {missing_columns}")
-    patches = []
-    for _, row in df.iterrows():
-        patch = {
-            "work_package_id": int(row['work_package_id']),
-            "lock_version": int(row['lock_version']),
-            "parent_id": int(row['parent_id'])
-        }
-        patches.append(patch)
-    return patches
-
-def write_work_packages_to_excel(work_packages, excel_file):
+    _check_required_columns(df, required_columns)
+    return _rows({col: _int_column(df, col) for col in required_columns})
+
+def read_work_package_updates_from_excel(excel_file):
+    """
+    수정한 export 파일(xlsx/csv/parquet)에서 work package 수정 정보를 읽어 리스트로 반환
+    컬럼: work_package_id (필수) + WORK_PACKAGE_UPDATE_COLUMNS 중 시트에 있는 컬럼만 (없는 컬럼은 비교하지 않음)
+    lock_version(선택): export 시점의 lockVersion (서버와 다르면 export 이후 변경된 것으로 보고 수정하지 않음)
+    """
+    df = read_table(excel_file, dtype={"subject": str, "description": str})
+    _check_required_columns(df, ["work_package_id"])
+    columns = {"work_package_id": _int_column(df, "work_package_id")}
+    if "lock_version" in df.columns:
+        columns["lock_version"] = _int_column(df, "lock_version")
+    for col in WORK_PACKAGE_UPDATE_COLUMNS:
+        if col not in df.columns:
+            continue
+        if col.endswith("_id"):
+            columns[col] = _int_column(df, col)
+        elif col.endswith("_date"):
+            columns[col] = _date_column(df, col)
+        else:
+            columns[col] = _column(df, col)
+    return _rows(columns)
+
+def write_work_packages_to_excel(work_packages, excel_file, hierarchy=False):
     """
     work_packages: list of dicts with keys matching the columns
     excel_file: output file path
+    hierarchy: True면 depth-first 순서로 정렬하고 계층 컬럼(depth, root_id, outline, subtree_start_date, subtree_due_date, hierarchy_issue) 추가
     Columns: work_package_id, subject, project_id, author_id, type_id, status_id, priority_id, assignee_id, category_id, start_date, due_date, duration, description, lock_version, parent_id
     """
-    columns = [
-        "work_package_id", "subject", "project_id", "author_id", "type_id", "status_id", "priority_id", "assignee_id", "category_id", "start_date", "due_date", "duration", "description", "lock_version", "parent_id"
-    ]
+    columns = WORK_PACKAGE_COLUMNS
+    if hierarchy:
+        from hierarchy.hierarchy import HIERARCHY_COLUMNS, order_by_hierarchy
+        work_packages = order_by_hierarchy([dict(wp) for wp in work_packages])
+        columns = WORK_PACKAGE_COLUMNS + HIERARCHY_COLUMNS
     df = pd.DataFrame(work_packages)
     # Ensure all columns exist
     for col in columns:
         if col not in df.columns:
             df[col] = None
     df = df[columns]  # Reorder columns
-    df.to_excel(excel_file, index=False) 
\ No newline at end of file
+    df.to_excel(excel_file, index=False)
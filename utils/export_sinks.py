@@ -0,0 +1,91 @@
+import csv
+from openpyxl import Workbook
+from utils.excel_utils import WORK_PACKAGE_COLUMNS
+
+EXPORT_FORMATS = ("xlsx", "csv", "parquet")
+
+# Parquet 컬럼 타입: 나머지 컬럼은 문자열
+_PARQUET_INT_COLUMNS = ("work_package_id", "lock_version", "depth", "root_id")
+
+class XlsxSink:
+    """
+    openpyxl write-only 모드로 행을 바로 기록하는 sink
+    """
+    def __init__(self, path, columns=WORK_PACKAGE_COLUMNS):
+        self.path = path
+        self.columns = list(columns)
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet()
+        self.sheet.append(self.columns)
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.sheet.append([row.get(col) for col in self.columns])
+
+    def close(self):
+        self.workbook.save(self.path)
+
+class CsvSink:
+    """
+    CSV 파일에 행을 바로 기록하는 sink
+    """
+    def __init__(self, path, columns=WORK_PACKAGE_COLUMNS):
+        self.path = path
+        self.columns = list(columns)
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=self.columns, extrasaction="ignore")
+        self.writer.writeheader()
+
+    def write_rows(self, rows):
+        self.writer.writerows(rows)
+
+    def close(self):
+        self.file.close()
+
+class ParquetSink:
+    """
+    write_rows 호출마다 하나의 record batch를 Parquet 파일에 기록하는 sink (pyarrow 필요)
+    """
+    def __init__(self, path, columns=WORK_PACKAGE_COLUMNS):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export에는 pyarrow가 필요합니다: pip3 install pyarrow")
+        self.pa = pa
+        self.path = path
+        self.columns = list(columns)
+        self.schema = pa.schema([
+            (col, pa.int64() if col in _PARQUET_INT_COLUMNS else pa.string())
+            for col in self.columns
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write_rows(self, rows):
+        rows = list(rows)
+        if not rows:
+            return
+        arrays = []
+        for field in self.schema:
+            values = [row.get(field.name) for row in rows]
+            if field.type == self.pa.string():
+                values = [None if v is None else str(v) for v in values]
+            arrays.append(self.pa.array(values, type=field.type))
+        self.writer.write_batch(self.pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+_SINKS = {
+    "xlsx": XlsxSink,
+    "csv": CsvSink,
+    "parquet": ParquetSink,
+}
+
+def open_export_sink(export_format, path, columns=WORK_PACKAGE_COLUMNS):
+    """
+    export_format(xlsx/csv/parquet)에 맞는 스트리밍 sink 생성
+    """
+    if export_format not in _SINKS:
+        raise ValueError(f"지원하지 않는 형식: {export_format} (가능: {', '.join(EXPORT_FORMATS)})")
+    return _SINKS[export_format](path, columns)
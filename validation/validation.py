@@ -0,0 +1,119 @@
+import pandas as pd
+from workpackages.create_work_package import compute_hierarchy_levels
+
+EMAIL_PATTERN = r"^[^@\s]+@[^@\s]+\.[^@\s]+$"
+
+def _errors(mask, column, message):
+    """
+    mask가 True인 행마다 오류 dict 생성 (row는 1부터 시작하는 데이터 행 번호)
+    """
+    return [{"row": int(i) + 1, "column": column, "message": message} for i in mask[mask].index]
+
+def _blank(series):
+    return series.isna() | series.astype(str).str.strip().eq("")
+
+def _parse_dates(series):
+    return pd.to_datetime(series, format="%Y-%m-%d", errors="coerce")
+
+def _sorted(errors):
+    return sorted(errors, key=lambda e: (e["row"], e["column"]))
+
+def validate_work_packages(work_packages):
+    """
+    read_work_packages_from_excel 결과 전체를 한 번에 검사해 행별 오류 리스트 반환
+    검사: subject/project_id/author 누락, 날짜 형식, due_date < start_date, row_key 중복, 알 수 없는 parent_key
+    """
+    df = pd.DataFrame(work_packages, columns=[
+        "subject", "project_id", "author_id", "author", "start_date", "due_date", "row_key", "parent_key",
+    ])
+    df = df.reset_index(drop=True)
+    errors = []
+    errors += _errors(_blank(df["subject"]), "subject", "subject가 비어 있습니다.")
+    errors += _errors(df["project_id"].isna(), "project_id", "project_id가 비어 있습니다.")
+    errors += _errors(df["author_id"].isna() & _blank(df["author"]), "author_id", "author_id(또는 author)가 비어 있습니다.")
+
+    start = _parse_dates(df["start_date"])
+    due = _parse_dates(df["due_date"])
+    errors += _errors(df["start_date"].notna() & start.isna(), "start_date", "start_date 형식이 YYYY-MM-DD가 아닙니다.")
+    errors += _errors(df["due_date"].notna() & due.isna(), "due_date", "due_date 형식이 YYYY-MM-DD가 아닙니다.")
+    errors += _errors(start.notna() & due.notna() & (due < start), "due_date", "due_date가 start_date보다 빠릅니다.")
+
+    keys = df["row_key"]
+    errors += _errors(keys.notna() & keys.duplicated(keep=False), "row_key", "row_key가 중복됩니다.")
+    parent_keys = df["parent_key"]
+    errors += _errors(parent_keys.notna() & ~parent_keys.isin(keys.dropna()), "parent_key", "존재하지 않는 parent_key입니다.")
+    errors += _errors(parent_keys.notna() & parent_keys.eq(keys), "parent_key", "자기 자신을 parent로 지정했습니다.")
+    if not any(e["column"] in ("row_key", "parent_key") for e in errors):
+        try:
+            compute_hierarchy_levels(work_packages)
+        except ValueError as e:
+            errors.append({"row": 0, "column": "parent_key", "message": str(e)})
+    return _sorted(errors)
+
+def validate_users(users):
+    """
+    read_users_from_excel 결과 전체를 한 번에 검사해 행별 오류 리스트 반환
+    검사: 필수 값 누락, login/email 중복(대소문자 무시), email 형식
+    """
+    df = pd.DataFrame(users, columns=["login", "email", "firstName", "lastName", "password"]).reset_index(drop=True)
+    errors = []
+    for col in df.columns:
+        errors += _errors(_blank(df[col]), col, f"{col}이(가) 비어 있습니다.")
+    for col in ("login", "email"):
+        normalized = df[col].astype(str).str.strip().str.lower().where(~_blank(df[col]))
+        errors += _errors(normalized.notna() & normalized.duplicated(keep=False), col, f"{col}이(가) 중복됩니다.")
+    emails = df["email"].astype(str).str.strip()
+    errors += _errors(~_blank(df["email"]) & ~emails.str.match(EMAIL_PATTERN), "email", "email 형식이 올바르지 않습니다.")
+    return _sorted(errors)
+
+def validate_parent_patches(parent_patches):
+    """
+    read_parent_patch_from_excel 결과 전체를 한 번에 검사해 행별 오류 리스트 반환
+    검사: 값 누락, work_package_id 중복, 자기 자신을 parent로 지정
+    """
+    df = pd.DataFrame(parent_patches, columns=["work_package_id", "lock_version", "parent_id"]).reset_index(drop=True)
+    errors = []
+    for col in df.columns:
+        errors += _errors(df[col].isna(), col, f"{col}이(가) 비어 있습니다.")
+    ids = df["work_package_id"]
+    errors += _errors(ids.notna() & ids.duplicated(keep=False), "work_package_id", "work_package_id가 중복됩니다.")
+    errors += _errors(ids.notna() & ids.eq(df["parent_id"]), "parent_id", "자기 자신을 parent로 지정했습니다.")
+    return _sorted(errors)
+
+def validate_work_package_updates(updates):
+    """
+    read_work_package_updates_from_excel 결과 전체를 한 번에 검사해 행별 오류 리스트 반환
+    검사: work_package_id 누락/중복, subject 비움, 날짜 형식, due_date < start_date, 자기 자신을 parent로 지정
+    """
+    df = pd.DataFrame(updates, columns=["work_package_id", "subject", "start_date", "due_date", "parent_id"]).reset_index(drop=True)
+    present = set(updates[0]) if updates else set()
+    errors = []
+    ids = df["work_package_id"]
+    errors += _errors(ids.isna(), "work_package_id", "work_package_id가 비어 있습니다.")
+    errors += _errors(ids.notna() & ids.duplicated(keep=False), "work_package_id", "work_package_id가 중복됩니다.")
+    if "subject" in present:
+        errors += _errors(_blank(df["subject"]), "subject", "subject가 비어 있습니다.")
+    start = _parse_dates(df["start_date"])
+    due = _parse_dates(df["due_date"])
+    errors += _errors(df["start_date"].notna() & start.isna(), "start_date", "start_date 형식이 YYYY-MM-DD가 아닙니다.")
+    errors += _errors(df["due_date"].notna() & due.isna(), "due_date", "due_date 형식이 YYYY-MM-DD가 아닙니다.")
+    errors += _errors(start.notna() & due.notna() & (due < start), "due_date", "due_date가 start_date보다 빠릅니다.")
+    errors += _errors(ids.notna() & ids.eq(df["parent_id"]), "parent_id", "자기 자신을 parent로 지정했습니다.")
+    return _sorted(errors)
+
+def report_validation_errors(errors, report_file=None, max_lines=50):
+    """
+    검증 결과 출력 (report_file이 있으면 전체 오류를 CSV로 기록), 오류가 없으면 True 반환
+    row가 0인 오류는 특정 행이 아닌 시트 전체에 대한 오류
+    """
+    if report_file:
+        pd.DataFrame(errors, columns=["row", "column", "message"]).to_csv(report_file, index=False)
+    if not errors:
+        print("✅ 사전 검증 통과")
+        return True
+    print(f"❌ 사전 검증 실패: {len(errors)}건 ({len({e['row'] for e in errors})}개 행)")
+    for e in errors[:max_lines]:
+        print(f"  {str(e['row']) + '번째 행' if e['row'] else '전체'} [{e['column']}] {e['message']}")
+    if len(errors) > max_lines:
+        print(f"  ... 외 {len(errors) - max_lines}건" + (f" (전체: {report_file})" if report_file else ""))
+    return False
@@ -1,5 +1,9 @@
-import requests
-import pandas as pd
+from requester.requester import post_request, patch_request
+from requester.parallel import run_in_parallel
+from payloads.work_package_payload import build_work_package_bodies, compute_durations, build_parent_patch_payload
+from workpackages.get_work_packages import fetch_lock_versions
+from results.results import RowResult, ProgressPrinter
+from metrics.metrics import phase, record_retry
 
 def create_work_package(api_endpoint, payload, headers):
     """
@@ -9,66 +13,195 @@ def create_work_package(api_endpoint, payload, headers):
     :param headers: 인증 및 Content-Type 헤더
     :return: response 객체
     """
-    try:
-        response = requests.post(api_endpoint, headers=headers, json=payload)
-        return response
-    except requests.exceptions.RequestException as e:
-        print(f"❌ 네트워크 오류: {e}")
-        return None
+    return post_request(api_endpoint, payload, headers)
 
-def bulk_create_work_packages(api_endpoint, headers, work_packages, excel_file=None):
+def write_back_created_ids(excel_file, results):
     """
-    여러 개의 work package를 생성하는 함수
-    :param api_endpoint: work_packages API endpoint
-    :param headers: 인증 및 Content-Type 헤더
-    :param work_packages: work package payload dict의 리스트
-    :param excel_file: 원본 엑셀 파일 경로 (id, lockVersion 기록용, 선택)
-    :return: 각 work package 생성 결과 리스트
+    생성 결과의 id, lockVersion을 원본 엑셀 파일의 work_package_id, lock_version 컬럼에 기록
+    results: 입력 행 순서와 같은 RowResult 리스트 (None은 요청하지 않은 행)
     """
-    results = []
-    ids = []
-    lock_versions = []
-    for payload in work_packages:
-        resp = create_work_package(api_endpoint, payload, headers)
-        results.append(resp)
-        if resp is not None and resp.status_code == 201:
-            data = resp.json()
-            ids.append(data.get("id"))
-            lock_versions.append(data.get("lockVersion"))
-        else:
-            ids.append(None)
-            lock_versions.append(None)
-    # 엑셀 파일에 결과 기록
-    if excel_file is not None:
-        try:
-            df = pd.read_excel(excel_file)
+    ids = [result.id if result is not None and result.ok else None for result in results]
+    lock_versions = [result.lock_version if result is not None and result.ok else None for result in results]
+    from utils.excel_utils import WORK_PACKAGE_DTYPES, read_table, write_table
+    try:
+        with phase("excel_write"):
+            # 숫자처럼 보이는 텍스트 컬럼(row_key "001" 등)이 바뀌지 않도록 읽을 때와 같은 dtype 사용
+            df = read_table(excel_file, dtype=WORK_PACKAGE_DTYPES)
             df["work_package_id"] = ids
             df["lock_version"] = lock_versions
-            df.to_excel(excel_file, index=False)
-        except Exception as e:
-            print(f"❌ 엑셀 파일에 결과 기록 실패: {e}")
+            write_table(df, excel_file)
+    except Exception as e:
+        print(f"❌ 엑셀 파일에 결과 기록 실패: {e}")
+
+def compute_hierarchy_levels(work_packages):
+    """
+    row_key / parent_key로 연결된 행들을 위상 정렬해 레벨별 행 인덱스 리스트로 반환
+    레벨 0은 시트 내 부모가 없는 행, 레벨 n의 부모는 모두 레벨 n-1 이하에 있음
+    알 수 없는 parent_key, 중복 row_key, 순환 참조는 ValueError
+    """
+    key_to_index = {}
+    for idx, wp in enumerate(work_packages):
+        key = wp.get("row_key")
+        if key is None:
+            continue
+        if key in key_to_index:
+            raise ValueError(f"중복 row_key: {key} ({key_to_index[key] + 1}행, {idx + 1}행)")
+        key_to_index[key] = idx
+
+    children = {}
+    level = []
+    for idx, wp in enumerate(work_packages):
+        parent_key = wp.get("parent_key")
+        if parent_key is None:
+            level.append(idx)
+            continue
+        if parent_key not in key_to_index:
+            raise ValueError(f"{idx + 1}행: 존재하지 않는 parent_key {parent_key}")
+        children.setdefault(key_to_index[parent_key], []).append(idx)
+
+    levels = []
+    placed = 0
+    while level:
+        levels.append(level)
+        placed += len(level)
+        level = [child for idx in level for child in children.get(idx, [])]
+    if placed != len(work_packages):
+        placed_rows = {idx for level in levels for idx in level}
+        cyclic_rows = [str(idx + 1) for idx in range(len(work_packages)) if idx not in placed_rows]
+        raise ValueError(f"parent_key 순환 참조가 있습니다. ({', '.join(cyclic_rows)}행)")
+    return levels
+
+def work_package_row_key(wp, idx):
+    """
+    journal에 기록할 행 키 (row_key가 없으면 1부터 시작하는 행 번호)
+    """
+    return wp.get("row_key") or f"#{idx + 1}"
+
+def bulk_create_work_package_rows(api_endpoint, headers, work_packages, excel_file=None, concurrency=1, journal=None):
+    """
+    read_work_packages_from_excel 행 목록으로 work package 생성 (부모를 자식보다 먼저 생성)
+    계층 레벨별로 병렬 생성하며, 자식의 payload에는 생성된 부모 id를 _links.parent로 바로 넣음
+    레벨마다 보낼 행의 payload를 한 번에 JSON bytes로 만든 뒤 전송 (duration은 전체 행을 한 번에 계산)
+    부모 생성에 실패한 행은 요청 없이 건너뜀 (결과의 status는 None)
+    journal: 행별 결과를 즉시 기록할 Journal (이미 성공으로 기록된 행은 요청 없이 재사용)
+    진행 상황은 행이 끝날 때마다 출력
+    :return: 각 행의 생성 결과(RowResult) 리스트 (입력 순서 유지)
+    """
+    levels = compute_hierarchy_levels(work_packages)
+    results = [None] * len(work_packages)
+    created_ids = {}
+    progress = ProgressPrinter(len(work_packages), "Work package 생성")
+    with phase("payload_build"):
+        durations = compute_durations(work_packages)
+
+    def create_row(item):
+        idx, body = item
+        result = RowResult.from_response(idx, create_work_package(api_endpoint, body, headers), (201,))
+        if journal is not None:
+            journal.record(work_package_row_key(work_packages[idx], idx), result)
+        progress(result, f"{idx+1}번째 행")
+        return result
+
+    for level in levels:
+        to_send = []
+        parent_ids = []
+        for idx in level:
+            wp = work_packages[idx]
+            entry = journal.completed(work_package_row_key(wp, idx)) if journal is not None else None
+            if entry is not None:
+                results[idx] = RowResult.from_journal(idx, entry)
+                progress(results[idx], f"{idx+1}번째 행", resumed=True)
+                continue
+            parent_id = None
+            if wp.get("parent_key") is not None:
+                parent_id = created_ids.get(wp["parent_key"])
+                if parent_id is None:
+                    results[idx] = RowResult(idx, error=f"부모({wp['parent_key']}) 생성 실패로 건너뜀")
+                    progress(results[idx], f"{idx+1}번째 행")
+                    continue
+            to_send.append(idx)
+            parent_ids.append(parent_id)
+        with phase("payload_build"):
+            bodies = build_work_package_bodies(
+                [work_packages[idx] for idx in to_send], parent_ids, [durations[idx] for idx in to_send],
+            )
+        for idx, result in zip(to_send, run_in_parallel(create_row, list(zip(to_send, bodies)), concurrency=concurrency)):
+            results[idx] = result
+        for idx in level:
+            key = work_packages[idx].get("row_key")
+            if key is not None and results[idx].ok:
+                created_ids[key] = results[idx].id
+    progress.summary()
+    if excel_file is not None:
+        write_back_created_ids(excel_file, results)
     return results
 
-def bulk_patch_work_package_parents(openproject_url, headers, parent_patches):
+def patch_work_package_parent(openproject_url, headers, work_package_id, lock_version, parent_id):
+    """
+    단일 work package의 parent를 PATCH로 설정
+    """
+    url = f"{openproject_url}/api/v3/work_packages/{work_package_id}"
+    payload = build_parent_patch_payload(lock_version, parent_id)
+    resp = patch_request(url, payload, headers)
+    if resp is None:
+        print(f"❌ 네트워크 오류 (work_package_id={work_package_id})")
+    return resp
+
+def bulk_patch_work_package_parents(openproject_url, headers, parent_patches, concurrency=1, conflict_retries=0, journal=None):
     """
     여러 work package의 parent를 PATCH로 설정하는 함수
     :param openproject_url: OpenProject base URL
     :param headers: 인증 및 Content-Type 헤더
     :param parent_patches: dict 리스트 (work_package_id, lock_version, parent_id)
-    :return: 각 patch 결과 리스트
+    :param concurrency: 동시에 보낼 최대 요청 수 (기본 1: 순차 실행)
+    :param conflict_retries: 409(lockVersion 충돌) 항목의 재시도 횟수. 재시도 전에 충돌 항목 전체의
+                             lockVersion을 id 필터 컬렉션 조회 한 번으로 갱신함 (기본 0: 재시도 없음)
+    :param journal: 항목별 결과를 즉시 기록할 Journal (work_package_id 기준, 이미 성공한 항목은 건너뜀)
+    :return: 각 patch 결과(RowResult) 리스트 (입력 순서 유지)
     """
-    results = []
-    for patch in parent_patches:
-        work_package_id = patch["work_package_id"]
-        lock_version = patch["lock_version"]
-        parent_id = patch["parent_id"]
-        url = f"{openproject_url}/api/v3/work_packages/{work_package_id}"
-        from payloads.work_package_payload import build_parent_patch_payload
-        payload = build_parent_patch_payload(lock_version, parent_id)
-        try:
-            resp = requests.patch(url, headers=headers, json=payload)
-            results.append(resp)
-        except requests.exceptions.RequestException as e:
-            print(f"❌ 네트워크 오류 (work_package_id={work_package_id}): {e}")
-            results.append(None)
-    return results 
\ No newline at end of file
+    lock_versions = [patch["lock_version"] for patch in parent_patches]
+    progress = ProgressPrinter(len(parent_patches), "parent patch")
+    final_attempt = conflict_retries == 0
+
+    def patch_row(idx):
+        patch = parent_patches[idx]
+        name = f"work_package_id={patch['work_package_id']}"
+        if journal is not None:
+            entry = journal.completed(patch["work_package_id"])
+            if entry is not None:
+                result = RowResult.from_journal(idx, entry)
+                progress(result, name, resumed=True)
+                return result
+        resp = patch_work_package_parent(openproject_url, headers, patch["work_package_id"], lock_versions[idx], patch["parent_id"])
+        result = RowResult.from_response(idx, resp)
+        if journal is not None:
+            journal.record(patch["work_package_id"], result)
+        # 재시도할 409는 마지막 시도가 끝난 뒤에만 출력
+        if final_attempt or result.status != 409:
+            progress(result, name)
+        return result
+
+    pending = list(range(len(parent_patches)))
+    results = [None] * len(parent_patches)
+    for attempt in range(conflict_retries + 1):
+        final_attempt = attempt == conflict_retries
+        for idx, result in zip(pending, run_in_parallel(patch_row, pending, concurrency=concurrency)):
+            results[idx] = result
+        pending = [idx for idx in pending if results[idx].status == 409]
+        if not pending or final_attempt:
+            break
+        print(f"🔄 lockVersion 충돌 {len(pending)}건 재시도 ({attempt + 1}/{conflict_retries})")
+        failed_ids = []
+        current = fetch_lock_versions(openproject_url, headers, {parent_patches[idx]["work_package_id"] for idx in pending}, failed_ids=failed_ids)
+        for idx in pending:
+            wp_id = parent_patches[idx]["work_package_id"]
+            if wp_id not in current:
+                # lockVersion을 모르면 재시도해도 다시 409이므로 여기서 실패로 확정
+                results[idx].error = "lockVersion 재조회 실패" if wp_id in failed_ids else "lockVersion 재조회: 서버에 없습니다"
+                progress(results[idx], f"work_package_id={wp_id}")
+                continue
+            lock_versions[idx] = current[wp_id]
+            record_retry(f"{openproject_url}/api/v3/work_packages/{wp_id}")
+        pending = [idx for idx in pending if parent_patches[idx]["work_package_id"] in current]
+    progress.summary()
+    return results
@@ -1,54 +1,215 @@
-import requests
-from utils.excel_utils import write_work_packages_to_excel
+import itertools
+from requester.requester import get_request
+from requester.parallel import iter_in_parallel, run_in_parallel
+from metrics.metrics import phase
 from endpoints.endpoints import get_work_packages_list_endpoint
 
+# flatten_work_package가 사용하는 필드만 요청할 때의 select 목록
+WORK_PACKAGE_SELECT = ["total", "count", "pageSize"] + [
+    f"elements/{field}" for field in (
+        "id", "subject", "project", "author", "type", "status", "priority", "assignee", "category",
+        "startDate", "dueDate", "duration", "description", "lockVersion", "parent", "updatedAt",
+    )
+]
+
+# select를 400으로 거부한 서버 (이후 요청은 select 없이 전송)
+_select_unsupported = set()
+
 def extract_id_from_link(link):
     href = link.get("href") if link else None
     if href:
         return href.split("/")[-1]
     return None
 
-def fetch_all_work_packages(openproject_url, headers, page_size=100):
+def flatten_work_package(wp):
+    """
+    HAL work package 하나를 Excel export용 dict로 변환
+    """
+    links = wp.get("_links", {})
+    return {
+        "work_package_id": wp.get("id"),
+        "subject": wp.get("subject"),
+        "project_id": extract_id_from_link(links.get("project")),
+        "author_id": extract_id_from_link(links.get("author")),
+        "type_id": extract_id_from_link(links.get("type")),
+        "status_id": extract_id_from_link(links.get("status")),
+        "priority_id": extract_id_from_link(links.get("priority")),
+        "assignee_id": extract_id_from_link(links.get("assignee")),
+        "category_id": extract_id_from_link(links.get("category")),
+        "start_date": wp.get("startDate"),
+        "due_date": wp.get("dueDate"),
+        "duration": wp.get("duration"),
+        "description": wp.get("description", {}).get("raw") if isinstance(wp.get("description"), dict) else wp.get("description"),
+        "lock_version": wp.get("lockVersion"),
+        "parent_id": extract_id_from_link(links.get("parent")),
+        "updated_at": wp.get("updatedAt"),
+    }
+
+def build_work_package_filters(project_ids=(), statuses=(), type_ids=(), assignee_ids=(), updated_since=None):
+    """
+    export 옵션을 API filters로 변환 (조건이 없어도 빈 리스트를 보내 서버 기본 필터(열린 항목만)를 끔)
+    다른 조건의 유무와 관계없이, 그리고 미러(sync)와 같게 statuses가 없으면 모든 status를 포함
+    statuses: status id 또는 "open" / "closed" (섞어 쓸 수 없음)
+    updated_since: YYYY-MM-DD 또는 ISO 8601 시각 (updatedAt >= updated_since)
+    """
+    filters = []
+    if project_ids:
+        filters.append({"project": {"operator": "=", "values": [str(p) for p in project_ids]}})
+    if statuses:
+        keywords = {str(s).strip().lower() for s in statuses}
+        if keywords & {"open", "closed"}:
+            if len(keywords) > 1:
+                raise ValueError("status는 open/closed 하나 또는 status id 목록으로만 지정할 수 있습니다.")
+            filters.append({"status": {"operator": "o" if "open" in keywords else "c", "values": []}})
+        else:
+            filters.append({"status": {"operator": "=", "values": [str(s) for s in statuses]}})
+    if type_ids:
+        filters.append({"type": {"operator": "=", "values": [str(t) for t in type_ids]}})
+    if assignee_ids:
+        filters.append({"assignee": {"operator": "=", "values": [str(a) for a in assignee_ids]}})
+    if updated_since:
+        filters.append({"updatedAt": {"operator": "<>d", "values": [updated_since, ""]}})
+    return filters
+
+def fetch_work_packages_page(openproject_url, headers, offset, page_size, filters=None, select=None):
+    """
+    work package 목록의 한 페이지 조회 (offset은 1부터 시작하는 페이지 번호)
+    select가 있으면 해당 필드만 요청하고, 서버가 400으로 거부하면 select 없이 다시 조회
+    실패 시 None 반환
+    """
+    if openproject_url in _select_unsupported:
+        select = None
+    url = get_work_packages_list_endpoint(openproject_url, offset=offset, page_size=page_size, filters=filters, select=select)
+    resp = get_request(url, headers=headers)
+    if select and resp is not None and resp.status_code == 400:
+        _select_unsupported.add(openproject_url)
+        print("⚠️ 서버가 select 파라미터를 지원하지 않아 전체 필드로 조회합니다.")
+        return fetch_work_packages_page(openproject_url, headers, offset, page_size, filters)
+    if resp is None or resp.status_code != 200:
+        print(f"❌ Failed to fetch work packages (page {offset}): {resp.status_code if resp is not None else 'No Response'}")
+        return None
+    return resp.json()
+
+def iter_work_package_pages(openproject_url, headers, page_size=100, concurrency=4, filters=None, select=None, failed_pages=None):
+    """
+    work package 목록을 페이지 단위로 yield (각 페이지는 flatten된 dict 리스트)
+    첫 페이지에서 total을 읽은 뒤 나머지 페이지를 최대 concurrency개씩 병렬 조회하며,
+    페이지 순서는 유지되고 한 번에 메모리에 올라가는 페이지 수는 제한됨
+    filters: API filters (get_work_packages_list_endpoint 참고)
+    select: 요청할 필드 목록 (예: WORK_PACKAGE_SELECT)
+    failed_pages: 리스트를 넘기면 재시도 후에도 실패해 건너뛴 페이지 번호를 추가 (결과가 불완전한지 호출자가 판단)
+    """
+    first_page = fetch_work_packages_page(openproject_url, headers, 1, page_size, filters, select)
+    if first_page is None:
+        if failed_pages is not None:
+            failed_pages.append(1)
+        return
+    total = first_page.get("total", 0)
+    # 서버가 pageSize를 제한할 수 있으므로 실제 적용된 값 사용
+    page_size = first_page.get("pageSize") or page_size
+    page_count = -(-total // page_size)
+    remaining_pages = iter_in_parallel(
+        lambda offset: fetch_work_packages_page(openproject_url, headers, offset, page_size, filters, select),
+        range(2, page_count + 1),
+        concurrency=concurrency,
+    )
+    for offset, page in enumerate(itertools.chain([first_page], remaining_pages), 1):
+        if page is None:
+            if failed_pages is not None:
+                failed_pages.append(offset)
+            continue
+        elements = page.get("_embedded", {}).get("elements", [])
+        yield [flatten_work_package(wp) for wp in elements]
+
+def fetch_all_work_packages(openproject_url, headers, page_size=100, concurrency=4, filters=None, select=None, failed_pages=None):
     """
     Fetch all work packages from the OpenProject API, handling pagination.
-    Returns a list of dicts with required fields for Excel export.
-    """
-    all_packages = []
-    offset = 1
-    while True:
-        url = get_work_packages_list_endpoint(openproject_url, offset=offset, page_size=page_size)
-        resp = requests.get(url, headers=headers)
-        if resp.status_code != 200:
-            print(f"❌ Failed to fetch work packages: {resp.status_code}")
-            break
-        data = resp.json()
-        elements = data.get("_embedded", {}).get("elements", [])
-        for wp in elements:
-            all_packages.append({
-                "work_package_id": wp.get("id"),
-                "subject": wp.get("subject"),
-                "project_id": extract_id_from_link(wp.get("_links", {}).get("project")),
-                "author_id": extract_id_from_link(wp.get("_links", {}).get("author")),
-                "type_id": extract_id_from_link(wp.get("_links", {}).get("type")),
-                "status_id": extract_id_from_link(wp.get("_links", {}).get("status")),
-                "priority_id": extract_id_from_link(wp.get("_links", {}).get("priority")),
-                "assignee_id": extract_id_from_link(wp.get("_links", {}).get("assignee")),
-                "category_id": extract_id_from_link(wp.get("_links", {}).get("category")),
-                "start_date": wp.get("startDate"),
-                "due_date": wp.get("dueDate"),
-                "duration": wp.get("duration"),
-                "description": wp.get("description", {}).get("raw") if isinstance(wp.get("description"), dict) else wp.get("description"),
-                "lock_version": wp.get("lockVersion"),
-                "parent_id": extract_id_from_link(wp.get("_links", {}).get("parent")),
-            })
-        total = data.get("total", 0)
-        count = data.get("count", 0)
-        if offset + count > total:
-            break
-        offset += count
-    return all_packages
-
-def export_work_packages_to_excel(openproject_url, headers, excel_file="workpackages.xlsx"):
-    work_packages = fetch_all_work_packages(openproject_url, headers)
-    write_work_packages_to_excel(work_packages, excel_file)
-    print(f"✅ Exported {len(work_packages)} work packages to {excel_file}")
+    Yields one dict per work package (with the fields needed for export), in page order.
+    failed_pages: see iter_work_package_pages
+    """
+    for rows in iter_work_package_pages(openproject_url, headers, page_size=page_size, concurrency=concurrency, filters=filters, select=select, failed_pages=failed_pages):
+        yield from rows
+
+def export_work_packages(openproject_url, headers, output_file="workpackages.xlsx", export_format="xlsx", concurrency=4, filters=None, hierarchy=False):
+    """
+    work package 전체(filters가 있으면 조건에 맞는 것만)를 페이지 단위로 받아 바로 sink에 기록 (메모리 사용량 일정)
+    export에 쓰는 필드만 select로 요청
+    export_format: xlsx / csv / parquet
+    hierarchy: True면 전체를 받은 뒤 depth-first 순서와 계층 컬럼으로 기록 (write_export_pages 참고)
+    반환: 기록한 행 수 (조회에 실패한 페이지가 있어 파일이 불완전하면 None)
+    """
+    failed_pages = []
+    pages = iter_work_package_pages(openproject_url, headers, concurrency=concurrency, filters=filters, select=WORK_PACKAGE_SELECT, failed_pages=failed_pages)
+    exported = write_export_pages(pages, output_file, export_format, hierarchy=hierarchy)
+    if failed_pages:
+        print(f"❌ 페이지 {len(failed_pages)}개 조회 실패 (page {', '.join(map(str, failed_pages))}): {output_file}은(는) 불완전합니다.")
+        return None
+    return exported
+
+def write_export_pages(pages, output_file, export_format="xlsx", hierarchy=False, batch_size=1000):
+    """
+    페이지(dict 리스트) iterable을 순서대로 export 파일에 기록하고 기록한 행 수 반환
+    hierarchy: True면 모든 행을 모아 hierarchy.order_by_hierarchy로 정렬하고 계층 컬럼 추가
+               (정렬에 전체 목록이 필요하므로 이 경우 메모리 사용량은 행 수에 비례)
+    """
+    from utils.export_sinks import open_export_sink
+    from utils.excel_utils import WORK_PACKAGE_COLUMNS
+    columns = WORK_PACKAGE_COLUMNS
+    if hierarchy:
+        from hierarchy.hierarchy import HIERARCHY_COLUMNS, order_by_hierarchy, report_hierarchy_issues
+        rows = order_by_hierarchy([row for rows in pages for row in rows])
+        report_hierarchy_issues(rows)
+        pages = (rows[start:start + batch_size] for start in range(0, len(rows), batch_size))
+        columns = WORK_PACKAGE_COLUMNS + HIERARCHY_COLUMNS
+    sink = open_export_sink(export_format, output_file, columns)
+    exported = 0
+    try:
+        for rows in pages:
+            with phase("excel_write"):
+                sink.write_rows(rows)
+            exported += len(rows)
+    finally:
+        sink.close()
+    print(f"✅ Exported {exported} work packages to {output_file}")
+    return exported
+
+def fetch_lock_versions(openproject_url, headers, work_package_ids, chunk_size=100, failed_ids=None):
+    """
+    id 필터 컬렉션 조회로 여러 work package의 현재 lockVersion을 한 번에 조회
+    failed_ids: 리스트를 넘기면 조회에 실패한 페이지 때문에 받지 못한 id를 추가 (서버에 없는 id와 구분)
+    반환: {work_package_id: lock_version}
+    """
+    ids = list(work_package_ids)
+    lock_versions = {}
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        filters = [{"id": {"operator": "=", "values": [str(wp_id) for wp_id in chunk]}}]
+        failed_pages = []
+        for row in fetch_all_work_packages(openproject_url, headers, page_size=len(chunk), concurrency=1, filters=filters, failed_pages=failed_pages):
+            lock_versions[int(row["work_package_id"])] = row["lock_version"]
+        if failed_pages and failed_ids is not None:
+            failed_ids.extend(wp_id for wp_id in chunk if wp_id not in lock_versions)
+    return lock_versions
+
+def fetch_work_packages_by_id(openproject_url, headers, work_package_ids, chunk_size=100, concurrency=4, failed_ids=None):
+    """
+    id 필터 컬렉션 조회로 여러 work package의 현재 상태를 chunk 단위 병렬 조회
+    failed_ids: 리스트를 넘기면 조회에 실패한 페이지 때문에 받지 못한 id를 추가 (서버에 없는 id와 구분)
+    반환: {work_package_id: flatten된 dict} (서버에 없거나 조회에 실패한 id는 빠짐)
+    """
+    ids = list(work_package_ids)
+    chunks = [ids[start:start + chunk_size] for start in range(0, len(ids), chunk_size)]
+
+    def fetch_chunk(chunk):
+        filters = [{"id": {"operator": "=", "values": [str(wp_id) for wp_id in chunk]}}]
+        failed_pages = []
+        rows = list(fetch_all_work_packages(openproject_url, headers, page_size=len(chunk), concurrency=1, filters=filters, select=WORK_PACKAGE_SELECT, failed_pages=failed_pages))
+        return rows, bool(failed_pages)
+
+    work_packages = {}
+    for chunk, (rows, failed) in zip(chunks, run_in_parallel(fetch_chunk, chunks, concurrency=concurrency)):
+        for row in rows:
+            work_packages[int(row["work_package_id"])] = row
+        if failed and failed_ids is not None:
+            failed_ids.extend(wp_id for wp_id in chunk if wp_id not in work_packages)
+    return work_packages
@@ -0,0 +1,124 @@
+from requester.requester import patch_request
+from requester.parallel import run_in_parallel
+from payloads.work_package_payload import build_work_package_update_payload
+from workpackages.get_work_packages import fetch_lock_versions
+from metrics.metrics import phase, record_retry
+from results.results import RowResult, ProgressPrinter
+
+def _normalize(col, value):
+    """
+    시트 값과 서버 값을 같은 형태로 맞춤 (id는 int, 빈 문자열은 None)
+    """
+    if value is None or value == "":
+        return None
+    if col.endswith("_id"):
+        return int(value)
+    return str(value)
+
+def diff_work_package(update, current):
+    """
+    시트 행과 현재 서버 상태를 비교해 바뀐 컬럼만 {컬럼: 새 값}으로 반환
+    """
+    changes = {}
+    for col, value in update.items():
+        if col in ("work_package_id", "lock_version"):
+            continue
+        new_value = _normalize(col, value)
+        if new_value != _normalize(col, current.get(col)):
+            changes[col] = new_value
+    return changes
+
+def _stale_message(base_version, current_version):
+    if base_version > current_version:
+        return f"비교 대상이 시트보다 오래되었습니다 (lock_version {base_version} > {current_version}, 미러라면 sync 후 다시 실행)"
+    return f"export 이후 서버에서 변경되었습니다 (lock_version {base_version} → {current_version}, 다시 export해서 수정)"
+
+def patch_work_package(openproject_url, headers, work_package_id, lock_version, changes):
+    """
+    단일 work package의 바뀐 필드만 PATCH
+    """
+    url = f"{openproject_url}/api/v3/work_packages/{work_package_id}"
+    resp = patch_request(url, build_work_package_update_payload(lock_version, changes), headers)
+    if resp is None:
+        print(f"❌ 네트워크 오류 (work_package_id={work_package_id})")
+    return resp
+
+def bulk_update_work_packages(openproject_url, headers, updates, current, concurrency=1, conflict_retries=0):
+    """
+    시트 행을 현재 상태와 비교해 바뀐 행만 PATCH (바뀐 필드만), 바뀌지 않은 행은 요청하지 않음
+    시트에 lock_version(export 시점)이 있으면 현재 lockVersion과 같은 행만 그 값으로 수정하고,
+    다르면 export 이후 다른 사람이 바꾼 필드를 되돌리지 않도록 요청 없이 충돌로 기록 (409도 재시도하지 않음)
+    lock_version이 없는 행은 시트 값을 원하는 상태로 보고 현재 lockVersion으로 수정
+    :param updates: read_work_package_updates_from_excel 결과
+    :param current: {work_package_id: 현재 상태 dict} (fetch_work_packages_by_id 또는 load_mirror_work_packages 결과)
+    :param concurrency: 동시에 보낼 최대 요청 수 (기본 1: 순차 실행)
+    :param conflict_retries: lock_version이 없는 행의 409(lockVersion 충돌) 재시도 횟수. 재시도 전에 lockVersion을 한 번에 갱신함
+    :return: 바뀐 행의 RowResult 리스트 (row는 updates의 인덱스, 입력 순서 유지)와 서버에 없는 id 리스트
+    """
+    with phase("diff"):
+        changed = []
+        stale = []
+        missing = []
+        for row, update in enumerate(updates):
+            wp_id = update["work_package_id"]
+            if wp_id not in current:
+                missing.append(wp_id)
+                continue
+            changes = diff_work_package(update, current[wp_id])
+            if not changes:
+                continue
+            base_version = update.get("lock_version")
+            if base_version is not None and base_version != current[wp_id]["lock_version"]:
+                stale.append((row, wp_id, changes, _stale_message(base_version, current[wp_id]["lock_version"])))
+            else:
+                changed.append((row, wp_id, changes))
+    unchanged = len(updates) - len(changed) - len(stale) - len(missing)
+    print(f"📊 {len(updates)}행 중 변경 {len(changed)}건, 충돌 {len(stale)}건, 변경 없음 {unchanged}건, 서버에 없음 {len(missing)}건")
+    unversioned = sum(1 for row, _, _ in changed if updates[row].get("lock_version") is None)
+    if unversioned:
+        print(f"⚠️ lock_version이 없는 {unversioned}행은 export 이후의 서버 변경을 감지할 수 없어 현재 상태 기준으로 수정합니다.")
+    lock_versions = [current[wp_id]["lock_version"] for _, wp_id, _ in changed]
+    progress = ProgressPrinter(len(changed) + len(stale), "수정")
+    stale_results = []
+    for row, wp_id, changes, message in stale:
+        stale_results.append(RowResult(row, error=message))
+        progress(stale_results[-1], f"work_package_id={wp_id} ({', '.join(changes)})")
+    final_attempt = conflict_retries == 0
+
+    def patch_row(idx):
+        row, wp_id, changes = changed[idx]
+        result = RowResult.from_response(row, patch_work_package(openproject_url, headers, wp_id, lock_versions[idx], changes))
+        versioned = updates[row].get("lock_version") is not None
+        if result.status == 409 and versioned:
+            result.error = "수정 도중 서버에서 변경되었습니다 (다시 export해서 수정)"
+        # 재시도할 409는 마지막 시도가 끝난 뒤에만 출력
+        if final_attempt or result.status != 409 or versioned:
+            progress(result, f"work_package_id={wp_id} ({', '.join(changes)})")
+        return result
+
+    pending = list(range(len(changed)))
+    results = [None] * len(changed)
+    for attempt in range(conflict_retries + 1):
+        final_attempt = attempt == conflict_retries
+        for idx, result in zip(pending, run_in_parallel(patch_row, pending, concurrency=concurrency)):
+            results[idx] = result
+        # export 시점의 lock_version으로 보낸 행은 재시도하면 다른 사람의 변경을 덮어쓰므로 재시도하지 않음
+        pending = [idx for idx in pending if results[idx].status == 409 and updates[changed[idx][0]].get("lock_version") is None]
+        if not pending or final_attempt:
+            break
+        print(f"🔄 lockVersion 충돌 {len(pending)}건 재시도 ({attempt + 1}/{conflict_retries})")
+        failed_ids = []
+        latest = fetch_lock_versions(openproject_url, headers, {changed[idx][1] for idx in pending}, failed_ids=failed_ids)
+        for idx in pending:
+            row, wp_id, changes = changed[idx]
+            if wp_id not in latest:
+                # lockVersion을 모르면 재시도해도 다시 409이므로 여기서 실패로 확정
+                results[idx].error = "lockVersion 재조회 실패" if wp_id in failed_ids else "lockVersion 재조회: 서버에 없습니다"
+                progress(results[idx], f"work_package_id={wp_id} ({', '.join(changes)})")
+                continue
+            lock_versions[idx] = latest[wp_id]
+            record_retry(f"{openproject_url}/api/v3/work_packages/{wp_id}")
+        pending = [idx for idx in pending if changed[idx][1] in latest]
+    if changed or stale:
+        progress.summary()
+    return sorted(results + stale_results, key=lambda result: result.row), missing